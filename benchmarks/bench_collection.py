@@ -0,0 +1,39 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = {
+    "import lib": [sys.executable, "-c", "import lib.base_case, lib.user_pool"],
+    "collect-only": [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider"],
+    "-k selection": [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "-k", "without_one_field and email"]
+}
+
+
+def measure(command: list, runs: int):
+    env = dict(os.environ, ENV=os.environ.get('ENV', 'local'))
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure interpreter startup, import and pytest collection time")
+    parser.add_argument("--runs", type=int, default=10, help="runs of every command")
+    args = parser.parse_args()
+
+    print(f"{'Command':<16}{'Median, ms':>12}{'Min, ms':>10}{'Max, ms':>10}")
+    for name, command in COMMANDS.items():
+        timings = measure(command, args.runs)
+        print(f"{name:<16}{statistics.median(timings) * 1000:>12.0f}{min(timings) * 1000:>10.0f}{max(timings) * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# Everything runs against the in-process stub server, never against the real API
+os.environ['ENV'] = 'local'
+os.environ.setdefault('CLEANUP_USERS', '0')
+
+from environment import ENV_OBJECT
+from lib.allure_steps import AllureSteps
+from lib.assertions import Assertions
+from lib.base_case import BaseCase
+from lib.logger import Logger
+from lib.my_requests import MyRequests
+from lib.response import CachedResponse
+from lib.session_pool import SessionPool
+
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+
+
+def bench_raw_http():
+    session = SessionPool.get_session(ENV_OBJECT.get_base_url())
+    url = f"{ENV_OBJECT.get_base_url()}/user/2"
+    timeout = SessionPool.get_timeout()
+    return lambda: session.get(url, timeout=timeout).content
+
+
+def bench_send_without_log():
+    def run():
+        Logger.log_format = Logger.OFF
+        try:
+            MyRequests.get("/user/2")
+        finally:
+            Logger.log_format = Logger.BOTH
+    return run
+
+
+def bench_send():
+    return lambda: MyRequests.get("/user/2")
+
+
+def bench_send_with_allure():
+    def run():
+        AllureSteps.enabled = True
+        try:
+            MyRequests.get("/user/2")
+        finally:
+            AllureSteps.enabled = False
+    return run
+
+
+def bench_logging():
+    response = MyRequests.get("/user/2")
+    url = f"{ENV_OBJECT.get_base_url()}/user/2"
+
+    def run():
+        Logger.add_request(url, None, {}, {}, 'GET', ENV_OBJECT.get_base_url())
+        Logger.add_response(response)
+    return run
+
+
+def bench_json_assertions():
+    raw_response = MyRequests.get("/user/2").raw_response
+
+    def run():
+        # A new wrapper every time, so JSON parsing is measured too
+        response = CachedResponse(raw_response)
+        Assertions.assert_code_status(response, 200)
+        Assertions.assert_json_has_key(response, "username")
+        Assertions.assert_json_has_not_keys(response, ["email", "firstName", "lastName"])
+        Assertions.assert_json_value_by_name(response, "username", "Vitaliy", "Wrong username")
+    return run
+
+
+def bench_create_user_and_login():
+    base_case = BaseCase()
+    return base_case.create_user_and_login
+
+
+BENCHMARKS = {
+    "raw HTTP GET": bench_raw_http,
+    "MyRequests.get, no log": bench_send_without_log,
+    "MyRequests.get": bench_send,
+    "MyRequests.get + allure": bench_send_with_allure,
+    "Logger request+response": bench_logging,
+    "JSON assertions": bench_json_assertions,
+    "create_user_and_login": bench_create_user_and_login
+}
+
+
+def measure(function, rounds: int, iterations: int, warmup: int):
+    for _ in range(warmup):
+        function()
+
+    # Time per call in every round, rounds are summarised like pytest-benchmark does
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            function()
+        timings.append((time.perf_counter() - start) / iterations)
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "rounds": rounds,
+        "iterations": iterations
+    }
+
+
+def load_baseline(file_name: str):
+    if not os.path.exists(file_name):
+        return None
+    with open(file_name, encoding='utf-8') as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baseline(file_name: str, results: dict):
+    with open(file_name, 'w', encoding='utf-8') as baseline_file:
+        json.dump({"python": sys.version.split()[0], "results": results}, baseline_file, indent=2)
+
+
+def compare(results: dict, baseline: dict, threshold: float):
+    regressions = []
+    for name, stats in results.items():
+        baseline_stats = baseline["results"].get(name)
+        if baseline_stats is None:
+            continue
+        change = stats["median"] / baseline_stats["median"] - 1
+        if change > threshold:
+            regressions.append((name, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the overhead lib/ adds on top of raw HTTP against the local stub")
+    parser.add_argument("--rounds", type=int, default=20, help="rounds of every benchmark")
+    parser.add_argument("--iterations", type=int, default=20, help="calls in every round")
+    parser.add_argument("--warmup", type=int, default=10, help="calls before measuring")
+    parser.add_argument("-k", dest="keyword", default=None, help="run only benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline file to compare with and save to")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="fail when a median is slower than the baseline by more than this fraction")
+    args = parser.parse_args()
+
+    # Logs of the benchmark itself go to a throwaway directory
+    Logger.logs_dir = tempfile.mkdtemp(prefix="bench_logs_")
+    Logger.log_format = Logger.BOTH
+    AllureSteps.enabled = False
+
+    results = {}
+    for name, benchmark in BENCHMARKS.items():
+        if args.keyword is not None and args.keyword not in name:
+            continue
+        results[name] = measure(benchmark(), args.rounds, args.iterations, args.warmup)
+
+    Logger.close()
+    MyRequests.close_transport()
+    SessionPool.close_all()
+
+    baseline = None if args.save else load_baseline(args.baseline)
+    raw = results.get("raw HTTP GET")
+
+    print(f"{'Benchmark':<26}{'Median, us':>12}{'Min, us':>10}{'Stddev, us':>12}{'Overhead, us':>14}{'Baseline':>10}")
+    for name, stats in results.items():
+        overhead = ""
+        if raw is not None and name.startswith("MyRequests"):
+            overhead = f"{(stats['median'] - raw['median']) * 1e6:.0f}"
+
+        change = ""
+        if baseline is not None and name in baseline["results"]:
+            change = f"{(stats['median'] / baseline['results'][name]['median'] - 1) * 100:+.0f}%"
+
+        print(f"{name:<26}{stats['median'] * 1e6:>12.0f}{stats['min'] * 1e6:>10.0f}{stats['stddev'] * 1e6:>12.0f}"
+              f"{overhead:>14}{change:>10}")
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for name, change in regressions:
+            print(f"Regression: {name} is {change * 100:.0f}% slower than the baseline")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
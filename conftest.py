@@ -0,0 +1,101 @@
+import pytest
+from lib.allure_steps import AllureSteps
+from lib.async_my_requests import AsyncMyRequests
+from lib.cassette import Cassette
+from lib.logger import Logger
+from lib.my_requests import MyRequests
+from lib.session_pool import SessionPool
+from lib.user_pool import UserPool
+from environment import ENV_OBJECT
+
+pytest_plugins = [
+    "lib.plugins.timing",
+    "lib.plugins.cleanup",
+    "lib.plugins.prefetch",
+    "lib.plugins.health",
+    "lib.plugins.sharding",
+    "lib.plugins.profiling",
+    "lib.plugins.environments"
+]
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "live: always send requests to the network, even in cassette replay mode")
+    # allure-pytest writes results only with --alluredir, without it steps are pure overhead
+    AllureSteps.enabled = bool(config.getoption("--alluredir", default=None))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def http_session_pool():
+    yield SessionPool
+    AsyncMyRequests.shutdown()
+    MyRequests.close_transport()
+    SessionPool.close_all()
+    Cassette.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def log_writer():
+    yield Logger
+    Logger.close()
+
+
+def pytest_sessionfinish(session):
+    # Only the xdist controller (or a plain run) merges, workers have "workerinput"
+    if not hasattr(session.config, "workerinput"):
+        Logger.merge_worker_logs()
+        if Cassette.mode != Cassette.OFF:
+            Cassette.compact()
+
+
+@pytest.fixture(autouse=True)
+def cassette_live_switch(request):
+    Cassette.live = request.node.get_closest_marker("live") is not None
+    yield
+    Cassette.live = False
+
+
+@pytest.fixture
+def user_pool(api_environment):
+    # Every environment has its own users, see lib/plugins/environments.py
+    return UserPool.for_environment(ENV_OBJECT.get_env())
+
+
+@pytest.fixture
+def shared_user(user_pool):
+    # For tests that only read or expect their changes to be rejected
+    # Users must really exist on the server, so tests using them are never replayed
+    Cassette.live = True
+    user_data = user_pool.checkout()
+    yield user_data
+    user_pool.checkin(user_data)
+
+
+@pytest.fixture
+def shared_users(user_pool):
+    # Call as shared_users(count), missing users are created concurrently
+    Cassette.live = True
+    checked_out = []
+
+    def checkout(count):
+        users = user_pool.checkout_many(count)
+        checked_out.extend(users)
+        return users
+
+    yield checkout
+    for user_data in checked_out:
+        user_pool.checkin(user_data)
+
+
+@pytest.fixture
+def fresh_user(setup_prefetcher, api_environment):
+    # For tests that change or delete the user, it is never returned to the pool
+    Cassette.live = True
+    return setup_prefetcher.take_fresh_user()
+
+
+@pytest.fixture
+def protected_user(user_pool):
+    # Its token goes to TokenCache and its file, a replayed login would store a stale one
+    Cassette.live = True
+    return user_pool.get_protected_account()
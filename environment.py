@@ -1,24 +1,47 @@
+import contextvars
 import os
+from contextlib import contextmanager
 
 class Environment:
     DEV = 'dev'
     PROD = 'prod'
+    LOCAL = 'local'
 
     URLS = {
         DEV: 'https://playground.learnqa.ru/api_dev',
         PROD: 'https://playground.learnqa.ru/api'
     }
 
+    # Overrides ENV for the current thread or asyncio task, so one run can use several environments
+    _current = contextvars.ContextVar('environment', default=None)
+
     def __init__(self):
         try:
             self.env = os.environ['ENV']
         except KeyError:
             self.env = self.DEV
 
+    def get_env(self):
+        return self._current.get() or self.env
+
+    @contextmanager
+    def use(self, env: str):
+        token = self._current.set(env)
+        try:
+            yield
+        finally:
+            self._current.reset(token)
+
     def get_base_url(self):
-        if self.env in self.URLS:
-            return self.URLS[self.env]
+        env = self.get_env()
+        if env == self.LOCAL:
+            from lib.fake_api import FakeApiServer
+            return FakeApiServer.get_base_url()
+        elif env in self.URLS:
+            return self.URLS[env]
+        elif env.startswith(('http://', 'https://')):
+            return env.rstrip('/')
         else:
-            raise Exception(f'Unknown value of ENV variable {self.env}')
+            raise Exception(f'Unknown value of ENV variable {env}')
 
-ENV_OBJECT = Environment()
\ No newline at end of file
+ENV_OBJECT = Environment()
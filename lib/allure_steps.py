@@ -0,0 +1,34 @@
+import threading
+from contextlib import nullcontext
+
+
+class AllureSteps:
+    # Switched off by conftest.py when the run has no --alluredir, allure is then never imported by lib
+    enabled = True
+
+    _local = threading.local()
+
+    @classmethod
+    def set_thread_enabled(cls, enabled: bool):
+        # Background threads that run outside of any test must not open steps in the report
+        cls._local.enabled = enabled
+
+    @classmethod
+    def is_enabled(cls):
+        return cls.enabled and getattr(cls._local, 'enabled', True)
+
+    @classmethod
+    def step(cls, title: str):
+        if not cls.is_enabled():
+            return nullcontext()
+
+        import allure
+        return allure.step(title)
+
+    @classmethod
+    def attach_text(cls, body: str, name: str):
+        if not cls.is_enabled():
+            return
+
+        import allure
+        allure.attach(body, name=name, attachment_type=allure.attachment_type.TEXT)
@@ -1,34 +1,49 @@
+from __future__ import annotations
 import json
-from requests import Response
+from typing import TYPE_CHECKING
+from lib.schemas import VALIDATORS
+
+if TYPE_CHECKING:
+    from requests import Response
+
 
 class Assertions:
     @staticmethod
-    def assert_json_value_by_name(response: Response, name, expected_value, error_message):
+    def _get_json(response: Response):
         try:
-            response_as_dict = response.json()
+            return response.json()
         except json.JSONDecodeError:
             assert False, f"Response is not in JSON format. Response text is '{response.text}'"
 
+
+    @staticmethod
+    def assert_json_value_by_name(response: Response, name, expected_value, error_message):
+        response_as_dict = Assertions._get_json(response)
+
         assert name in response_as_dict, f"Response JSON does not have key '{name}'"
         assert response_as_dict[name] == expected_value, error_message
 
 
+    @staticmethod
+    def assert_json_values_by_names(response: Response, expected_values: dict):
+        response_as_dict = Assertions._get_json(response)
+
+        for name, expected_value in expected_values.items():
+            assert name in response_as_dict, f"Response JSON does not have key '{name}'"
+            assert response_as_dict[name] == expected_value, \
+                f"Unexpected value of key '{name}'. Expected: {expected_value}. Actual: {response_as_dict[name]}"
+
+
     @staticmethod
     def assert_json_has_key(response: Response, name):
-        try:
-            response_as_dict = response.json()
-        except json.JSONDecodeError:
-            assert False, f"Response is not in JSON format. Response text is '{response.text}'"
+        response_as_dict = Assertions._get_json(response)
 
         assert name in response_as_dict, f"Response JSON does not have key '{name}'"
 
 
     @staticmethod
     def assert_json_has_keys(response: Response, names: list):
-        try:
-            response_as_dict = response.json()
-        except json.JSONDecodeError:
-            assert False, f"Response is not in JSON format. Response text is '{response.text}'"
+        response_as_dict = Assertions._get_json(response)
 
         for name in names:
             assert name in response_as_dict, f"Response JSON does not have key '{name}'"
@@ -36,15 +51,29 @@ class Assertions:
 
     @staticmethod
     def assert_json_has_not_key(response: Response, name):
-        try:
-            response_as_dict = response.json()
-        except json.JSONDecodeError:
-            assert False, f"Response is not in JSON format. Response text is '{response.text}'"
+        response_as_dict = Assertions._get_json(response)
 
         assert name not in response_as_dict, f"Response JSON should not have key '{name}', but it is present"
 
 
+    @staticmethod
+    def assert_json_has_not_keys(response: Response, names: list):
+        response_as_dict = Assertions._get_json(response)
+
+        for name in names:
+            assert name not in response_as_dict, f"Response JSON should not have key '{name}', but it is present"
+
+
     @staticmethod
     def assert_code_status(response: Response, expected_status_code):
         assert response.status_code == expected_status_code, \
-            f"Unexpected status code! Expected: {expected_status_code}. Actual: {response.status_code}"
\ No newline at end of file
+            f"Unexpected status code! Expected: {expected_status_code}. Actual: {response.status_code}"
+
+
+    @staticmethod
+    def assert_schema(response: Response, endpoint: str, state: str):
+        assert (endpoint, state) in VALIDATORS, f"No response schema for '{endpoint}' in state '{state}'"
+
+        errors = VALIDATORS[(endpoint, state)](response.status_code, Assertions._get_json(response))
+
+        assert not errors, f"Response of '{endpoint}' does not match schema '{state}': " + "; ".join(errors)
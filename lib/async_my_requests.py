@@ -0,0 +1,90 @@
+import contextvars
+import os
+import threading
+from contextlib import contextmanager
+from lib.allure_steps import AllureSteps
+from lib.my_requests import MyRequests
+
+
+class AsyncMyRequests:
+    max_workers = int(os.environ.get('ASYNC_MAX_WORKERS', 20))
+    _executor = None
+    _executor_lock = threading.Lock()
+    _batch = contextvars.ContextVar('async_requests_batch', default=None)
+
+    @staticmethod
+    async def get(url: str, data: dict = None, headers: dict = None, cookies: dict = None):
+        return await AsyncMyRequests._send(url, data, headers, cookies, 'GET')
+
+    @staticmethod
+    async def post(url: str, data: dict = None, headers: dict = None, cookies: dict = None):
+        return await AsyncMyRequests._send(url, data, headers, cookies, 'POST')
+
+    @staticmethod
+    async def put(url: str, data: dict = None, headers: dict = None, cookies: dict = None):
+        return await AsyncMyRequests._send(url, data, headers, cookies, 'PUT')
+
+    @staticmethod
+    async def delete(url: str, data: dict = None, headers: dict = None, cookies: dict = None):
+        return await AsyncMyRequests._send(url, data, headers, cookies, 'DELETE')
+
+
+    @classmethod
+    @contextmanager
+    def step(cls, title: str):
+        # Allure keeps one stack of open steps for the whole process, so steps of requests gathered
+        # on one event loop would nest into each other. The caller opens one step for the batch instead,
+        # the requests made inside it are attached to the step as a summary. Requests awaited one at a time
+        # outside of a batch get their own step.
+        requests = []
+        token = cls._batch.set(requests)
+        try:
+            with AllureSteps.step(title):
+                try:
+                    yield
+                finally:
+                    if requests:
+                        AllureSteps.attach_text("\n".join(requests), "Requests")
+        finally:
+            cls._batch.reset(token)
+
+
+    @classmethod
+    def _get_executor(cls):
+        if cls._executor is None:
+            with cls._executor_lock:
+                if cls._executor is None:
+                    from concurrent.futures import ThreadPoolExecutor
+                    cls._executor = ThreadPoolExecutor(max_workers=cls.max_workers, thread_name_prefix="async-requests")
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls):
+        with cls._executor_lock:
+            executor = cls._executor
+            cls._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @classmethod
+    async def _send(cls, url: str, data: dict, headers: dict, cookies: dict, method: str):
+        batch = cls._batch.get()
+        if batch is None:
+            # A single awaited request gets the same step as in MyRequests
+            with AllureSteps.step(f"{method} request to URL '{url}'"):
+                return await cls._run_in_executor(url, data, headers, cookies, method)
+
+        response = await cls._run_in_executor(url, data, headers, cookies, method)
+        batch.append(f"{method} {url} -> {response.status_code}")
+        return response
+
+    @classmethod
+    async def _run_in_executor(cls, url: str, data: dict, headers: dict, cookies: dict, method: str):
+        # The blocking send runs on executor threads, each of them gets its own pooled session
+        import asyncio
+        loop = asyncio.get_running_loop()
+        # The context carries the environment of the calling task to the executor thread
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            cls._get_executor(), context.run, MyRequests._send, url, data, headers, cookies, method
+        )
@@ -1,8 +1,14 @@
+from __future__ import annotations
 import json.decoder
-from requests import Response
 from datetime import datetime
+from typing import TYPE_CHECKING
 from lib.assertions import Assertions
 from lib.my_requests import MyRequests
+from lib.async_my_requests import AsyncMyRequests
+from lib.utils import generate_unique_suffix
+
+if TYPE_CHECKING:
+    from requests import Response
 
 
 class BaseCase:
@@ -27,15 +33,17 @@ class BaseCase:
 
 
     def prepare_registration_data(self, email=None):
+        unique_part = generate_unique_suffix()
+
         if email is None:
             base_part = 'learnqa'
             domain = 'example.com'
             random_part = datetime.now().strftime("%m%d%Y%H%M%S")
-            email = f"{base_part}{random_part}@{domain}"
+            email = f"{base_part}{random_part}{unique_part}@{domain}"
 
         return {
             'password': '123',
-            'username': 'learnqa',
+            'username': f"learnqa{unique_part}",
             'firstName': 'learnqa',
             'lastName': 'learnqa',
             'email': email
@@ -52,9 +60,16 @@ class BaseCase:
 
         user_id = self.get_json_value(response_create, "id")
 
+        user_data = self.login(register_data["email"], register_data["password"])
+        user_data["user_id"] = user_id
+
+        return user_data
+
+
+    def login(self, email, password):
         login_data = {
-            "email": register_data["email"],
-            "password": register_data["password"]
+            "email": email,
+            "password": password
         }
 
         response_login = MyRequests.post("/user/login", data=login_data)
@@ -63,11 +78,100 @@ class BaseCase:
 
         token = self.get_header(response_login, "x-csrf-token")
         auth_sid = self.get_cookie(response_login, "auth_sid")
+        user_id = self.get_json_value(response_login, "user_id")
+
+        return {
+            "password": password,
+            "email": email,
+            "user_id": user_id,
+            "auth_sid": auth_sid,
+            "token": token
+        }
+
+
+    def is_logged_in(self, user_data):
+        response_auth = MyRequests.get(
+            "/user/auth",
+            headers={"x-csrf-token": user_data["token"]},
+            cookies={"auth_sid": user_data["auth_sid"]}
+        )
+
+        if response_auth.status_code != 200:
+            return False
+
+        # Registration returns the id as a string, auth methods as a number
+        return str(self.get_json_value(response_auth, "user_id")) == str(user_data["user_id"])
+
+
+    def run_async(self, coroutine):
+        import asyncio
+        return asyncio.run(coroutine)
+
+
+    def run_concurrently(self, coroutines: list, title: str = None):
+        async def gather():
+            import asyncio
+            return list(await asyncio.gather(*coroutines))
+
+        # One allure step for the whole batch, the steps of concurrent requests would nest into each other
+        with AsyncMyRequests.step(title or f"Send {len(coroutines)} requests concurrently"):
+            return self.run_async(gather())
+
+
+    async def register_user_async(self):
+        register_data = self.prepare_registration_data()
+
+        response_create = await AsyncMyRequests.post("/user/", data=register_data)
+
+        Assertions.assert_code_status(response_create, 200)
+        Assertions.assert_json_has_key(response_create, "id")
 
         return {
             "password": register_data["password"],
             "email": register_data["email"],
+            "user_id": self.get_json_value(response_create, "id")
+        }
+
+
+    async def create_user_and_login_async(self):
+        register_data = await self.register_user_async()
+
+        user_data = await self.login_async(register_data["email"], register_data["password"])
+        user_data["user_id"] = register_data["user_id"]
+
+        return user_data
+
+
+    async def create_users_async(self, count, login=True):
+        import asyncio
+
+        create_user = self.create_user_and_login_async if login else self.register_user_async
+        with AsyncMyRequests.step(f"Create {count} users concurrently"):
+            return list(await asyncio.gather(*[create_user() for _ in range(count)]))
+
+
+    def create_users(self, count, login=True):
+        return self.run_async(self.create_users_async(count, login))
+
+
+    async def login_async(self, email, password):
+        login_data = {
+            "email": email,
+            "password": password
+        }
+
+        response_login = await AsyncMyRequests.post("/user/login", data=login_data)
+
+        Assertions.assert_code_status(response_login, 200)
+
+        token = self.get_header(response_login, "x-csrf-token")
+        auth_sid = self.get_cookie(response_login, "auth_sid")
+        user_id = self.get_json_value(response_login, "user_id")
+
+        return {
+            "password": password,
+            "email": email,
             "user_id": user_id,
             "auth_sid": auth_sid,
             "token": token
-        }
\ No newline at end of file
+        }
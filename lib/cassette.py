@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import threading
+from urllib.parse import urlencode, urlsplit
+from lib.utils import UNIQUE_SUFFIX_PATTERN
+
+
+class Cassette:
+    OFF = 'off'
+    RECORD = 'record'
+    REPLAY = 'replay'
+
+    mode = os.environ.get('CASSETTE_MODE', OFF)
+    file_name = os.environ.get('CASSETTE_FILE', 'cassettes/cassette.jsonl')
+    # Set for tests marked "live", they always go to the network
+    live = False
+
+    AUTH_NAMES = ['x-csrf-token', 'auth_sid']
+
+    _entries = None
+    _file = None
+    _lock = threading.Lock()
+    _local = threading.local()
+
+    @classmethod
+    def set_thread_live(cls, live: bool):
+        # "live" for the current thread only, the class attribute follows the running test
+        cls._local.live = live
+
+    @classmethod
+    def is_enabled(cls):
+        return cls.mode != cls.OFF and not cls.live and not getattr(cls._local, 'live', False)
+
+    @staticmethod
+    def make_key(method: str, url: str, data: dict, headers: dict, cookies: dict):
+        # Generated emails and usernames are masked, auth is keyed by presence only:
+        # tokens change on every login, but the response depends on whether they were sent
+        path = urlsplit(url).path
+        body = urlencode(sorted((name, UNIQUE_SUFFIX_PATTERN.sub('<unique>', str(value)))
+                                for name, value in (data or {}).items()))
+        auth = ','.join(name for name in Cassette.AUTH_NAMES if name in headers or name in cookies)
+        return hashlib.sha1(f"{method} {path} {body} {auth}".encode('utf-8')).hexdigest()
+
+    @classmethod
+    def _load(cls):
+        if cls._entries is None:
+            entries = {}
+            if os.path.exists(cls.file_name):
+                with open(cls.file_name, encoding='utf-8') as cassette_file:
+                    for line in cassette_file:
+                        entry = json.loads(line)
+                        entries[entry["key"]] = entry
+            cls._entries = entries
+        return cls._entries
+
+    @classmethod
+    def find(cls, method: str, url: str, data: dict, headers: dict, cookies: dict):
+        with cls._lock:
+            entry = cls._load().get(cls.make_key(method, url, data, headers, cookies))
+
+        if entry is None:
+            return None
+
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["body"].encode('utf-8')
+        response.encoding = entry["encoding"]
+        response.url = url
+        response.cookies.update(entry["cookies"])
+        return response
+
+    @classmethod
+    def save(cls, method: str, url: str, data: dict, headers: dict, cookies: dict, response):
+        entry = {
+            "key": cls.make_key(method, url, data, headers, cookies),
+            "method": method,
+            "path": urlsplit(url).path,
+            "status": response.status_code,
+            "headers": dict(response.headers),
+            "cookies": dict(response.cookies),
+            "encoding": response.encoding,
+            "body": response.text
+        }
+
+        with cls._lock:
+            cls._load()[entry["key"]] = entry
+
+            if cls._file is None:
+                directory = os.path.dirname(cls.file_name)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                cls._file = open(cls.file_name, 'a', encoding='utf-8')
+            cls._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            cls._file.flush()
+
+    @classmethod
+    def close(cls):
+        with cls._lock:
+            if cls._file is not None:
+                cls._file.close()
+                cls._file = None
+
+    @classmethod
+    def compact(cls):
+        # Re-recorded keys are appended, keep only the last response for every key
+        cls.close()
+        if not os.path.exists(cls.file_name):
+            return
+
+        with cls._lock:
+            cls._entries = None
+            entries = cls._load()
+            with open(cls.file_name, 'w', encoding='utf-8') as cassette_file:
+                for entry in entries.values():
+                    cassette_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
@@ -0,0 +1,63 @@
+import os
+import threading
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    # Consecutive requests that could not reach the API before all further requests fail immediately, 0 disables
+    failure_threshold = int(os.environ.get('HTTP_CIRCUIT_BREAKER_THRESHOLD', 3))
+
+    _failures = 0
+    _reason = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def is_open(cls):
+        return cls._reason is not None
+
+    @classmethod
+    def get_reason(cls):
+        return cls._reason
+
+    @classmethod
+    def check(cls):
+        reason = cls._reason
+        if reason is not None:
+            raise CircuitOpenError(reason)
+
+    @classmethod
+    def trip(cls, reason: str):
+        with cls._lock:
+            if cls._reason is None:
+                cls._reason = reason
+
+    @classmethod
+    def record_success(cls):
+        cls._failures = 0
+
+    @classmethod
+    def record_failure(cls, url: str, error: Exception):
+        if not cls.failure_threshold or not cls.is_connection_error(error):
+            return
+
+        with cls._lock:
+            cls._failures += 1
+            failures = cls._failures
+
+        if failures >= cls.failure_threshold:
+            cls.trip(f"API is unavailable, {failures} requests in a row failed, the last to {url}: {error}")
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._failures = 0
+            cls._reason = None
+
+    @staticmethod
+    def is_connection_error(error: Exception):
+        # Only a dead or hanging server trips the breaker, HTTP errors are answers of a live one
+        import requests
+        return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
@@ -0,0 +1,87 @@
+import heapq
+import json
+import os
+import statistics
+
+
+class DurationDatabase:
+    file_name = os.environ.get('TEST_DURATIONS_FILE', '.test_durations.json')
+    # Weight of the latest run in the moving average and in the failure score
+    smoothing = float(os.environ.get('TEST_DURATIONS_SMOOTHING', 0.3))
+    # Tests never seen before
+    default_duration = 1.0
+
+    def __init__(self, file_name: str = None):
+        self.file_name = file_name if file_name is not None else DurationDatabase.file_name
+        self.entries = self._load()
+
+    def _load(self):
+        if not self.file_name or not os.path.exists(self.file_name):
+            return {}
+        try:
+            with open(self.file_name, encoding='utf-8') as db_file:
+                return json.load(db_file)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        if not self.file_name:
+            return
+
+        directory = os.path.dirname(self.file_name)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_file_name = f"{self.file_name}.{os.getpid()}.tmp"
+        with open(temp_file_name, 'w', encoding='utf-8') as db_file:
+            json.dump(self.entries, db_file, indent=1, sort_keys=True)
+        os.replace(temp_file_name, self.file_name)
+
+    def record(self, nodeid: str, duration: float, failed: bool):
+        entry = self.entries.get(nodeid)
+        if entry is None:
+            self.entries[nodeid] = {"duration": duration, "failure_score": 1.0 if failed else 0.0, "runs": 1}
+            return
+
+        entry["duration"] += (duration - entry["duration"]) * self.smoothing
+        entry["failure_score"] += ((1.0 if failed else 0.0) - entry["failure_score"]) * self.smoothing
+        entry["runs"] += 1
+
+    def get_default_duration(self):
+        # New tests are expected to be typical ones
+        if self.entries:
+            return statistics.median(entry["duration"] for entry in self.entries.values())
+        return self.default_duration
+
+    def get_duration(self, nodeid: str, default: float = None):
+        entry = self.entries.get(nodeid)
+        if entry is not None:
+            return entry["duration"]
+        return default if default is not None else self.get_default_duration()
+
+    def get_durations(self, nodeids: list):
+        # The median for unknown tests is computed once, not for each of them
+        default = self.get_default_duration()
+        return {nodeid: self.get_duration(nodeid, default) for nodeid in nodeids}
+
+    def get_failure_score(self, nodeid: str):
+        entry = self.entries.get(nodeid)
+        return entry["failure_score"] if entry is not None else 0.0
+
+    def split(self, nodeids: list, shards: int):
+        # Longest processing time first: every next test goes to the least loaded shard
+        durations = self.get_durations(nodeids)
+        loads = [(0.0, shard) for shard in range(shards)]
+        assignment = {}
+        for nodeid in sorted(nodeids, key=lambda nodeid: (-durations[nodeid], nodeid)):
+            load, shard = heapq.heappop(loads)
+            assignment[nodeid] = shard
+            heapq.heappush(loads, (load + durations[nodeid], shard))
+        return assignment
+
+    def get_shard_loads(self, nodeids: list, shards: int):
+        durations = self.get_durations(nodeids)
+        loads = [0.0] * shards
+        for nodeid, shard in self.split(nodeids, shards).items():
+            loads[shard] += durations[nodeid]
+        return loads
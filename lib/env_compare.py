@@ -0,0 +1,92 @@
+import os
+import threading
+from collections import defaultdict
+from lib.timing import RequestTimings
+from environment import ENV_OBJECT
+
+
+class ResponseComparison:
+    # Switched on by lib/plugins/environments.py when the run has several environments
+    enabled = False
+    # Responses beyond this are not compared, a test with a loop of requests stays within bounded memory
+    max_responses_per_test = int(os.environ.get('COMPARE_MAX_RESPONSES', 1000))
+
+    _responses = defaultdict(list)
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_shape(response):
+        # Ids and tokens differ between environments anyway, so JSON is compared by its keys
+        try:
+            body = response.json()
+        except Exception:
+            return response.text[:200]
+
+        if isinstance(body, dict):
+            return "{" + ", ".join(sorted(body)) + "}"
+        return type(body).__name__
+
+    @classmethod
+    def track(cls, method: str, path: str, response):
+        # Only requests of the test itself, setup depends on the state of the user pool of every environment
+        if not cls.enabled or RequestTimings.get_test_phase() != "call":
+            return
+
+        key = (RequestTimings.get_test_name(), ENV_OBJECT.get_env())
+        entry = [RequestTimings.get_endpoint(method, path), response.status_code, cls.get_shape(response)]
+        with cls._lock:
+            if len(cls._responses[key]) < cls.max_responses_per_test:
+                cls._responses[key].append(entry)
+
+    @classmethod
+    def get_responses(cls):
+        with cls._lock:
+            return [[test, env, entries] for (test, env), entries in cls._responses.items()]
+
+    @classmethod
+    def add_responses(cls, responses: list):
+        with cls._lock:
+            for test, env, entries in responses:
+                cls._responses[test, env].extend(entries)
+
+    @staticmethod
+    def get_base_test(test: str, env: str):
+        # "test_a[no_cookie-dev]" -> "test_a[no_cookie]", "test_a[dev]" -> "test_a"
+        if test.endswith(f"[{env}]"):
+            return test[:-len(env) - 2]
+        if test.endswith(f"-{env}]"):
+            return test[:-len(env) - 2] + "]"
+        return test
+
+    @classmethod
+    def find_differences(cls, envs: list):
+        by_test = defaultdict(dict)
+        with cls._lock:
+            for (test, env), entries in cls._responses.items():
+                by_test[cls.get_base_test(test, env)][env] = entries
+
+        differences = []
+        for test, by_env in sorted(by_test.items()):
+            length = max(len(entries) for entries in by_env.values())
+            for index in range(length):
+                answers = {env: tuple(by_env[env][index]) if index < len(by_env.get(env, [])) else None
+                           for env in envs}
+                if len(set(answers.values())) > 1:
+                    differences.append((test, index, answers))
+        return differences
+
+    @classmethod
+    def format_differences(cls, envs: list):
+        lines = []
+        for test, index, answers in cls.find_differences(envs):
+            lines.append(f"{test}, request {index + 1}:")
+            for env in envs:
+                answer = answers[env]
+                text = f"{answer[0]} -> {answer[1]} {answer[2]}" if answer is not None else "no request"
+                lines.append(f"    {env:<24} {text}")
+        return "\n".join(lines)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._responses.clear()
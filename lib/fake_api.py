@@ -0,0 +1,269 @@
+import json
+import re
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+REQUIRED_FIELDS = ['password', 'username', 'firstName', 'lastName', 'email']
+PROTECTED_USER_IDS = {1, 2, 3, 4, 5}
+MAX_NAME_LENGTH = 250
+
+
+class FakeUserStorage:
+    def __init__(self):
+        self.users = {}
+        self.sessions = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+        self.add_user({
+            'password': '1234',
+            'username': 'Vitaliy',
+            'firstName': 'Vitalii',
+            'lastName': 'Kotov',
+            'email': 'vinkotov@example.com'
+        })
+        for index in range(3, 6):
+            self.add_user({
+                'password': '1234',
+                'username': f'learnqa{index}',
+                'firstName': 'learnqa',
+                'lastName': 'learnqa',
+                'email': f'learnqa{index}@example.com'
+            }, user_id=index)
+
+    def add_user(self, data: dict, user_id: int = None):
+        with self._lock:
+            if user_id is None:
+                user_id = self._next_id
+                while user_id in self.users or user_id == 1:
+                    user_id += 1
+            self._next_id = max(self._next_id, user_id + 1)
+            self.users[user_id] = {field: data[field] for field in REQUIRED_FIELDS}
+            return user_id
+
+    def find_by_email(self, email: str):
+        for user_id, user in list(self.users.items()):
+            if user['email'] == email:
+                return user_id
+        return None
+
+    def login(self, user_id: int):
+        auth_sid = secrets.token_hex(16)
+        token = secrets.token_hex(16)
+        with self._lock:
+            self.sessions[auth_sid] = (user_id, token)
+        return auth_sid, token
+
+    def get_auth_user_id(self, auth_sid: str, token: str):
+        session = self.sessions.get(auth_sid)
+        if session is None or session[1] != token or session[0] not in self.users:
+            return 0
+        return session[0]
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Send headers and body in one packet, otherwise Nagle's algorithm delays keep-alive responses
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    user_path = re.compile(r'^/user/(\d+)$')
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body, headers: dict = None, cookies: dict = None):
+        if isinstance(body, (dict, list)):
+            content = json.dumps(body).encode('utf-8')
+            content_type = 'application/json'
+        else:
+            content = str(body).encode('utf-8')
+            content_type = 'text/html; charset=utf-8'
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        for name, value in (cookies or {}).items():
+            self.send_header('Set-Cookie', f'{name}={value}; Path=/; HttpOnly')
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _read_form(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8') if length else ''
+        return {name: values[-1] for name, values in parse_qs(body, keep_blank_values=True).items()}
+
+    def _get_auth_user_id(self):
+        cookies = {}
+        for part in (self.headers.get('Cookie') or '').split(';'):
+            name, _, value = part.strip().partition('=')
+            cookies[name] = value
+
+        auth_sid = cookies.get('auth_sid')
+        token = self.headers.get('x-csrf-token')
+        if not auth_sid or not token:
+            return None
+
+        return self.server.storage.get_auth_user_id(auth_sid, token)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        storage = self.server.storage
+
+        if path == '/user/auth':
+            self._send(200, {'user_id': self._get_auth_user_id() or 0})
+            return
+
+        match = self.user_path.match(path)
+        if match is None:
+            self._send(404, 'Not found')
+            return
+
+        user_id = int(match.group(1))
+        user = storage.users.get(user_id)
+        if user is None:
+            self._send(404, 'User not found')
+        elif self._get_auth_user_id() == user_id:
+            self._send(200, {
+                'id': str(user_id),
+                'username': user['username'],
+                'email': user['email'],
+                'firstName': user['firstName'],
+                'lastName': user['lastName']
+            })
+        else:
+            self._send(200, {'username': user['username']})
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        data = self._read_form()
+
+        if path == '/user/':
+            self._register(data)
+        elif path == '/user/login':
+            self._login(data)
+        else:
+            self._send(404, 'Not found')
+
+    def _register(self, data: dict):
+        storage = self.server.storage
+
+        missed = [field for field in REQUIRED_FIELDS if field not in data]
+        if missed:
+            self._send(400, f"The following required params are missed: {', '.join(missed)}")
+            return
+
+        if '@' not in data['email']:
+            self._send(400, 'Invalid email format')
+            return
+
+        if storage.find_by_email(data['email']) is not None:
+            self._send(400, f"Users with email '{data['email']}' already exists")
+            return
+
+        for field in ['username', 'firstName', 'lastName']:
+            if len(data[field]) < 2:
+                self._send(400, f"The value of '{field}' field is too short")
+                return
+            if len(data[field]) > MAX_NAME_LENGTH:
+                self._send(400, f"The value of '{field}' field is too long")
+                return
+
+        user_id = storage.add_user(data)
+        self._send(200, {'id': str(user_id)})
+
+    def _login(self, data: dict):
+        storage = self.server.storage
+
+        user_id = storage.find_by_email(data.get('email', ''))
+        if user_id is None or storage.users[user_id]['password'] != data.get('password'):
+            self._send(400, 'Invalid username/password supplied')
+            return
+
+        auth_sid, token = storage.login(user_id)
+        self._send(200, {'user_id': user_id}, headers={'x-csrf-token': token}, cookies={'auth_sid': auth_sid})
+
+    def do_PUT(self):
+        data = self._read_form()
+        match = self.user_path.match(urlsplit(self.path).path)
+        if match is None:
+            self._send(404, 'Not found')
+            return
+
+        user_id = int(match.group(1))
+        auth_user_id = self._get_auth_user_id()
+
+        if not auth_user_id:
+            self._send(400, {'error': 'Auth token not supplied'})
+        elif auth_user_id != user_id:
+            self._send(400, {'error': 'This user can only edit their own data.'})
+        elif 'email' in data and '@' not in data['email']:
+            self._send(400, {'error': 'Invalid email format'})
+        else:
+            for field in ['username', 'firstName', 'lastName']:
+                if field in data and len(data[field]) < 2:
+                    self._send(400, {'error': f'The value for field `{field}` is too short'})
+                    return
+                if field in data and len(data[field]) > MAX_NAME_LENGTH:
+                    self._send(400, {'error': f'The value for field `{field}` is too long'})
+                    return
+
+            user = self.server.storage.users[user_id]
+            for field in REQUIRED_FIELDS:
+                if field in data:
+                    user[field] = data[field]
+            self._send(200, {'success': '!'})
+
+    def do_DELETE(self):
+        self._read_form()
+        match = self.user_path.match(urlsplit(self.path).path)
+        if match is None:
+            self._send(404, 'Not found')
+            return
+
+        user_id = int(match.group(1))
+        auth_user_id = self._get_auth_user_id()
+
+        if not auth_user_id:
+            self._send(400, {'error': 'Auth token not supplied'})
+        elif user_id in PROTECTED_USER_IDS:
+            self._send(400, {'error': 'Please, do not delete test users with ID 1, 2, 3, 4 or 5.'})
+        elif auth_user_id != user_id:
+            self._send(400, {'error': 'This user can only delete their own account.'})
+        else:
+            self.server.storage.users.pop(user_id, None)
+            self._send(200, {'success': '!'})
+
+
+class FakeApiServer:
+    _server = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def start(cls, host: str = '127.0.0.1', port: int = 0):
+        with cls._lock:
+            if cls._server is None:
+                server = ThreadingHTTPServer((host, port), FakeApiHandler)
+                server.daemon_threads = True
+                server.storage = FakeUserStorage()
+                threading.Thread(target=server.serve_forever, name="fake-api", daemon=True).start()
+                cls._server = server
+        return cls._server
+
+    @classmethod
+    def get_base_url(cls):
+        server = cls.start()
+        host, port = server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @classmethod
+    def stop(cls):
+        with cls._lock:
+            if cls._server is not None:
+                cls._server.shutdown()
+                cls._server.server_close()
+                cls._server = None
@@ -0,0 +1,179 @@
+import argparse
+import threading
+import time
+from collections import defaultdict
+from lib.allure_steps import AllureSteps
+from lib.base_case import BaseCase
+from lib.my_requests import MyRequests
+from lib.session_pool import SessionPool
+from lib.logger import Logger
+from lib.utils import percentile
+
+
+class LoadStats:
+    def __init__(self):
+        self._latencies = defaultdict(list)
+        self._errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, elapsed: float, ok: bool):
+        with self._lock:
+            self._latencies[endpoint].append(elapsed)
+            if not ok:
+                self._errors[endpoint] += 1
+
+    def summary(self, wall_time: float):
+        with self._lock:
+            rows = []
+            for endpoint, latencies in sorted(self._latencies.items()):
+                rows.append({
+                    "endpoint": endpoint,
+                    "requests": len(latencies),
+                    "errors": self._errors[endpoint],
+                    "rps": len(latencies) / wall_time if wall_time else 0.0,
+                    "p50": percentile(latencies, 50),
+                    "p95": percentile(latencies, 95),
+                    "p99": percentile(latencies, 99)
+                })
+        return rows
+
+    def report(self, wall_time: float):
+        rows = self.summary(wall_time)
+        total = sum(row["requests"] for row in rows)
+
+        lines = [f"{'Endpoint':<20}{'Requests':>10}{'Errors':>8}{'RPS':>9}{'p50, ms':>10}{'p95, ms':>10}{'p99, ms':>10}"]
+        for row in rows:
+            lines.append(
+                f"{row['endpoint']:<20}{row['requests']:>10}{row['errors']:>8}{row['rps']:>9.1f}"
+                f"{row['p50'] * 1000:>10.1f}{row['p95'] * 1000:>10.1f}{row['p99'] * 1000:>10.1f}"
+            )
+        lines.append(f"Total: {total} requests in {wall_time:.1f}s, {total / wall_time if wall_time else 0:.1f} requests/s")
+        return "\n".join(lines)
+
+
+class RequestPacer:
+    # Spreads requests of all workers evenly to keep the total rate at the target
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate else 0
+        self._next_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            scheduled = max(self._next_time, now)
+            self._next_time = scheduled + self.interval
+
+        delay = scheduled - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class UserFlowScenario(BaseCase):
+    def __init__(self, stats: LoadStats, pacer: RequestPacer):
+        self.stats = stats
+        self.pacer = pacer
+
+    def _call(self, endpoint: str, method: str, url: str, expected_status_code: int = 200, **kwargs):
+        self.pacer.wait()
+
+        start = time.perf_counter()
+        try:
+            response = getattr(MyRequests, method)(url, **kwargs)
+        except Exception:
+            self.stats.record(endpoint, time.perf_counter() - start, False)
+            raise
+
+        ok = response.status_code == expected_status_code
+        self.stats.record(endpoint, time.perf_counter() - start, ok)
+        assert ok, f"Unexpected status code for {endpoint}: {response.status_code}"
+
+        return response
+
+    def run(self):
+        register_data = self.prepare_registration_data()
+        response_create = self._call("POST /user/", "post", "/user/", data=register_data)
+        user_id = self.get_json_value(response_create, "id")
+
+        login_data = {
+            "email": register_data["email"],
+            "password": register_data["password"]
+        }
+        response_login = self._call("POST /user/login", "post", "/user/login", data=login_data)
+        auth = {
+            "headers": {"x-csrf-token": self.get_header(response_login, "x-csrf-token")},
+            "cookies": {"auth_sid": self.get_cookie(response_login, "auth_sid")}
+        }
+
+        self._call("GET /user/auth", "get", "/user/auth", **auth)
+        self._call("GET /user/{id}", "get", f"/user/{user_id}", **auth)
+        self._call("PUT /user/{id}", "put", f"/user/{user_id}", data={"firstName": "Load Test"}, **auth)
+        self._call("DELETE /user/{id}", "delete", f"/user/{user_id}", **auth)
+
+
+class LoadRunner:
+    def __init__(self, concurrency: int = 10, duration: float = 60, ramp_up: float = 0, rate: float = 0):
+        self.concurrency = concurrency
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.stats = LoadStats()
+        self.pacer = RequestPacer(rate)
+        self.failed_flows = 0
+        self._lock = threading.Lock()
+
+    def _worker(self, start_delay: float, deadline: float):
+        time.sleep(start_delay)
+        scenario = UserFlowScenario(self.stats, self.pacer)
+
+        while time.monotonic() < deadline:
+            try:
+                scenario.run()
+            except Exception:
+                with self._lock:
+                    self.failed_flows += 1
+
+    def run(self):
+        start = time.monotonic()
+        deadline = start + self.duration
+
+        threads = []
+        for index in range(self.concurrency):
+            start_delay = self.ramp_up * index / self.concurrency
+            thread = threading.Thread(target=self._worker, args=(start_delay, deadline), daemon=True)
+            thread.start()
+            threads.append(thread)
+
+        for thread in threads:
+            thread.join()
+
+        return time.monotonic() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay the user API flows as load")
+    parser.add_argument("--concurrency", type=int, default=10, help="number of parallel virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="test duration in seconds")
+    parser.add_argument("--ramp-up", type=float, default=0, help="seconds to start all virtual users")
+    parser.add_argument("--rate", type=float, default=0, help="target total requests per second, 0 is unlimited")
+    parser.add_argument("--transport", default=MyRequests.transport_name,
+                        help="HTTP transport: requests or http2 (needs httpx[http2])")
+    args = parser.parse_args()
+
+    AllureSteps.enabled = False
+    MyRequests.transport_name = args.transport
+    runner = LoadRunner(args.concurrency, args.duration, args.ramp_up, args.rate)
+    wall_time = runner.run()
+
+    print(runner.stats.report(wall_time))
+    print(f"Failed flows: {runner.failed_flows}")
+
+    MyRequests.close_transport()
+    SessionPool.close_all()
+    Logger.close()
+
+
+if __name__ == "__main__":
+    main()
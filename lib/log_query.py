@@ -0,0 +1,121 @@
+import argparse
+import json
+import os
+from collections import defaultdict
+from lib.utils import percentile
+
+INDEXED_FIELDS = ["test", "endpoint", "status"]
+
+
+class LogIndex:
+    # Byte offsets of records by test, endpoint and status, cached next to the log until it changes
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.index_file_name = f"{file_name}.idx"
+        self.offsets = None
+
+    def _file_state(self):
+        stat = os.stat(self.file_name)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def load(self):
+        if os.path.exists(self.index_file_name):
+            with open(self.index_file_name, encoding='utf-8') as index_file:
+                index = json.load(index_file)
+            if index["state"] == self._file_state():
+                self.offsets = index["offsets"]
+                return self
+
+        return self.build()
+
+    def build(self):
+        offsets = {field: defaultdict(list) for field in INDEXED_FIELDS}
+
+        with open(self.file_name, 'rb') as log_file:
+            position = 0
+            for line in log_file:
+                if line.strip():
+                    record = json.loads(line)
+                    for field in INDEXED_FIELDS:
+                        offsets[field][str(record.get(field))].append(position)
+                position += len(line)
+
+        self.offsets = offsets
+        with open(self.index_file_name, 'w', encoding='utf-8') as index_file:
+            json.dump({"state": self._file_state(), "offsets": offsets}, index_file)
+
+        return self
+
+    def find(self, test: str = None, endpoint: str = None, status: str = None):
+        selected = None
+
+        def narrow(positions: set):
+            return positions if selected is None else selected & positions
+
+        if test is not None:
+            selected = narrow({offset for name, offsets in self.offsets["test"].items()
+                               if test in name for offset in offsets})
+        if endpoint is not None:
+            selected = narrow(set(self.offsets["endpoint"].get(endpoint, [])))
+        if status is not None:
+            selected = narrow(set(self.offsets["status"].get(str(status), [])))
+
+        if selected is None:
+            selected = {offset for offsets in self.offsets["endpoint"].values() for offset in offsets}
+
+        return sorted(selected)
+
+    def read(self, offsets: list):
+        with open(self.file_name, 'rb') as log_file:
+            for offset in offsets:
+                log_file.seek(offset)
+                yield json.loads(log_file.readline())
+
+
+def aggregate(records, field: str):
+    grouped = defaultdict(list)
+    for record in records:
+        grouped[str(record.get(field))].append(record["elapsed_ms"])
+
+    rows = [(key, len(values), sum(values) / len(values), percentile(values, 95), max(values))
+            for key, values in grouped.items()]
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Filter and aggregate structured request logs (logs/*.jsonl)")
+    parser.add_argument("file_name", help="path to a .jsonl log")
+    parser.add_argument("--test", help="part of the test name")
+    parser.add_argument("--endpoint", help="endpoint template, e.g. 'PUT /user/{id}'")
+    parser.add_argument("--status", help="response status code")
+    parser.add_argument("--min-ms", type=float, help="only requests slower than this")
+    parser.add_argument("--slowest", type=int, help="show only N slowest requests")
+    parser.add_argument("--group-by", choices=INDEXED_FIELDS, help="aggregate latency by field")
+    parser.add_argument("--full", action="store_true", help="print full records as JSON")
+    args = parser.parse_args()
+
+    index = LogIndex(args.file_name).load()
+    records = index.read(index.find(args.test, args.endpoint, args.status))
+    if args.min_ms is not None:
+        records = (record for record in records if record["elapsed_ms"] >= args.min_ms)
+    records = list(records)
+
+    if args.group_by:
+        print(f"{'Count':>7}{'Mean, ms':>10}{'p95, ms':>9}{'Max, ms':>9}  {args.group_by}")
+        for key, count, mean, p95, maximum in aggregate(records, args.group_by):
+            print(f"{count:>7}{mean:>10.1f}{p95:>9.1f}{maximum:>9.1f}  {key}")
+        return
+
+    if args.slowest:
+        records = sorted(records, key=lambda record: record["elapsed_ms"], reverse=True)[:args.slowest]
+
+    for record in records:
+        if args.full:
+            print(json.dumps(record, ensure_ascii=False))
+        else:
+            print(f"{record['time']}  {record['status']}  {record['elapsed_ms']:>8.1f} ms  "
+                  f"{record['endpoint']:<20}  {record['test']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import atexit
+import os
+import queue
+import sys
+import threading
+import time
+
+
+class LogWriter:
+    _STOP = object()
+
+    def __init__(self, file_name: str, queue_size: int = 10000, batch_size: int = 100,
+                 flush_interval: float = 1.0, max_file_size: int = 0, max_file_age: float = 0,
+                 backup_count: int = 5):
+        self.file_name = file_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_file_size = max_file_size
+        self.max_file_age = max_file_age
+        self.backup_count = backup_count
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._file = None
+        self._file_size = 0
+        self._file_opened_at = 0
+        self._thread = None
+        self._closed = False
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def write(self, data: str):
+        if self._thread is None:
+            self._start()
+        if self._closed:
+            raise ValueError(f"Log writer of {self.file_name} is closed")
+        # A full queue blocks the caller: memory stays bounded even if the disk falls behind
+        self._queue.put(data)
+
+    def flush(self):
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+            self._closed = True
+
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        batch = []
+        last_flush = time.monotonic()
+        stopped = False
+
+        while not stopped:
+            timeout = max(self.flush_interval - (time.monotonic() - last_flush), 0.01)
+            try:
+                item = self._queue.get(timeout=timeout)
+                if item is self._STOP:
+                    stopped = True
+                    self._queue.task_done()
+                else:
+                    batch.append(item)
+            except queue.Empty:
+                pass
+
+            if batch and (stopped or len(batch) >= self.batch_size
+                          or time.monotonic() - last_flush >= self.flush_interval):
+                self._write_batches(batch)
+                batch = []
+                last_flush = time.monotonic()
+
+        # Lines written while the writer was stopping were queued after the stop marker
+        leftover = []
+        while True:
+            try:
+                leftover.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if leftover:
+            self._write_batches(leftover)
+
+        self._close_file()
+
+    def _write_batches(self, batch: list):
+        # A failed write loses its batch but never the thread, otherwise write(), flush() and close() would hang
+        try:
+            self._write_batch(batch)
+        except Exception as e:
+            print(f"Failed to write {len(batch)} lines to {self.file_name}: {e!r}", file=sys.stderr)
+            try:
+                self._close_file()
+            except Exception:
+                self._file = None
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write_batch(self, batch: list):
+        data = "".join(batch)
+
+        if self._file is not None and self._should_rotate(len(data)):
+            self._rotate()
+        if self._file is None:
+            self._open_file()
+
+        self._file.write(data)
+        self._file.flush()
+        self._file_size += len(data.encode('utf-8'))
+
+    def _should_rotate(self, incoming_size: int):
+        if self.max_file_size and self._file_size + incoming_size > self.max_file_size:
+            return True
+        if self.max_file_age and time.monotonic() - self._file_opened_at > self.max_file_age:
+            return True
+        return False
+
+    def _open_file(self):
+        directory = os.path.dirname(self.file_name)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._file = open(self.file_name, 'a', encoding='utf-8')
+        self._file_size = self._file.tell()
+        self._file_opened_at = time.monotonic()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self):
+        self._close_file()
+
+        if self.backup_count <= 0:
+            os.remove(self.file_name)
+            return
+
+        oldest = f"{self.file_name}.{self.backup_count}"
+        if os.path.exists(oldest):
+            os.remove(oldest)
+
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.file_name}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.file_name}.{index + 1}")
+
+        os.replace(self.file_name, f"{self.file_name}.1")
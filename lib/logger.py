@@ -1,23 +1,129 @@
 import datetime
+import glob
+import json
 import os
-from requests import Response
+import shutil
+import threading
+from lib.log_writer import LogWriter
+from lib.response import CachedResponse
+from lib.timing import RequestTimings
+from lib.utils import get_worker_id
+
+# Set once in the main process, xdist workers inherit it and share the run id
+RUN_ID = os.environ.setdefault('TEST_RUN_ID', datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S"))
+
 
 class Logger:
-    file_name = f"logs/log_" + str(datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")) + ".log"
+    TEXT = 'text'
+    JSONL = 'jsonl'
+    BOTH = 'both'
+    # No request log at all, LOG_FORMAT=off
+    OFF = 'off'
+
+    logs_dir = "logs"
+    log_format = os.environ.get('LOG_FORMAT', BOTH)
+    max_body_length = int(os.environ.get('LOG_MAX_BODY_LENGTH', 10000))
+
+    writers = {}
+    _local = threading.local()
+
+    @classmethod
+    def get_file_name(cls, extension: str = "log"):
+        worker_id = get_worker_id()
+        if worker_id == 'master':
+            return f"{cls.logs_dir}/log_{RUN_ID}.{extension}"
+        return f"{cls.logs_dir}/log_{RUN_ID}_{worker_id}.{extension}"
+
+
+    @classmethod
+    def get_writer(cls, extension: str = "log"):
+        writer = cls.writers.get(extension)
+        if writer is None:
+            writer = LogWriter(
+                cls.get_file_name(extension),
+                queue_size=int(os.environ.get('LOG_QUEUE_SIZE', 10000)),
+                batch_size=int(os.environ.get('LOG_BATCH_SIZE', 100)),
+                flush_interval=float(os.environ.get('LOG_FLUSH_INTERVAL', 1.0)),
+                max_file_size=int(os.environ.get('LOG_MAX_FILE_SIZE', 50 * 1024 * 1024)),
+                max_file_age=float(os.environ.get('LOG_MAX_FILE_AGE', 0)),
+                backup_count=int(os.environ.get('LOG_BACKUP_COUNT', 5))
+            )
+            cls.writers[extension] = writer
+        return writer
+
 
     @classmethod
     def _write_log_to_file(cls, data: str):
-        with open(cls.file_name, 'a', encoding='utf-8') as logger_file:
-            logger_file.write(data)
+        if cls.log_format in (cls.TEXT, cls.BOTH):
+            cls.get_writer("log").write(data)
+
+
+    @classmethod
+    def _write_record(cls, record: dict):
+        if cls.log_format in (cls.JSONL, cls.BOTH):
+            cls.get_writer("jsonl").write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
 
 
     @classmethod
-    def add_request(cls, url: str, data: dict, headers: dict, cookies: dict, method: str):
-        testname = os.environ.get('PYTEST_CURRENT_TEST')
+    def flush(cls):
+        for writer in list(cls.writers.values()):
+            writer.flush()
+
+
+    @classmethod
+    def close(cls):
+        # A closed writer refuses new lines, logging after close() opens a new one on the same file
+        writers = cls.writers
+        cls.writers = {}
+        for writer in writers.values():
+            writer.close()
+
+
+    @classmethod
+    def merge_worker_logs(cls):
+        merged = []
+        for extension in ("log", "jsonl"):
+            merged_file_name = cls._merge_worker_files(extension)
+            if merged_file_name is not None:
+                merged.append(merged_file_name)
+        return merged
+
+
+    @classmethod
+    def _merge_worker_files(cls, extension: str):
+        worker_files = glob.glob(f"{cls.logs_dir}/log_{RUN_ID}_gw*.{extension}*")
+        if not worker_files:
+            return None
+
+        def sort_key(path):
+            # log_<run>_gw<N>.<extension>[.<backup>]: by worker, older backups first
+            base, _, backup = path.partition(f".{extension}")
+            worker = int(base.rsplit("_gw", 1)[1])
+            backup_index = int(backup[1:]) if backup else 0
+            return worker, -backup_index
+
+        merged_file_name = f"{cls.logs_dir}/log_{RUN_ID}.{extension}"
+        with open(merged_file_name, 'a', encoding='utf-8') as merged_file:
+            for path in sorted(worker_files, key=sort_key):
+                with open(path, encoding='utf-8') as worker_file:
+                    shutil.copyfileobj(worker_file, merged_file)
+                os.remove(path)
+
+        return merged_file_name
+
+
+    @classmethod
+    def add_request(cls, url: str, data: dict, headers: dict, cookies: dict, method: str, base_url: str = ''):
+        if cls.log_format == cls.OFF:
+            return
+
+        # The same name in both logs, requests of background threads are attributed like in the timings
+        testname = RequestTimings.get_test_name()
+        now = datetime.datetime.now()
 
         data_to_add = f"\n-----\n"
         data_to_add += f"Test: {testname}\n"
-        data_to_add = f"Time: {str(datetime.datetime.now())}\n"
+        data_to_add += f"Time: {str(now)}\n"
         data_to_add += f"Request method: {method}\n"
         data_to_add += f"Request URL: {url}\n"
         data_to_add += f"Request data: {data}\n"
@@ -27,15 +133,43 @@ class Logger:
 
         cls._write_log_to_file(data_to_add)
 
+        # Completed by add_response on the same thread into one structured record
+        cls._local.request = {
+            "time": now.isoformat(),
+            "test": testname,
+            "method": method,
+            "url": url,
+            "endpoint": RequestTimings.get_endpoint(method, url[len(base_url):] if url.startswith(base_url) else url),
+            "request_data": data,
+            "request_headers": headers,
+            "request_cookies": cookies
+        }
+
     @classmethod
-    def add_response(cls, response: Response):
+    def add_response(cls, response: CachedResponse):
+        if cls.log_format == cls.OFF:
+            return
+
         cookies_as_dict = dict(response.cookies)
         headers_as_dict = dict(response.headers)
+        body = response.get_log_body(cls.max_body_length)
 
         data_to_add = f"Response code: {response.status_code}\n"
-        data_to_add += f"Response text: {response.text}\n"
+        data_to_add += f"Response text: {body}\n"
         data_to_add += f"Response headers: {headers_as_dict}\n"
         data_to_add += f"Response cookies: {cookies_as_dict}\n"
         data_to_add += "\n-----\n"
 
-        cls._write_log_to_file(data_to_add)
\ No newline at end of file
+        cls._write_log_to_file(data_to_add)
+
+        record = getattr(cls._local, 'request', None) or {}
+        cls._local.request = None
+        record.update({
+            "status": response.status_code,
+            "elapsed_ms": round(response.elapsed.total_seconds() * 1000, 3),
+            "response_bytes": response.body_size,
+            "response_text": body,
+            "response_headers": headers_as_dict,
+            "response_cookies": cookies_as_dict
+        })
+        cls._write_record(record)
@@ -1,53 +1,151 @@
-import requests
-import allure
+import os
+import threading
+import time
+from lib.allure_steps import AllureSteps
+from lib.cassette import Cassette
+from lib.circuit_breaker import CircuitBreaker
+from lib.env_compare import ResponseComparison
 from lib.logger import Logger
+from lib.response import CachedResponse, StreamedBody
+from lib.retry import RetryScheduler
+from lib.session_pool import SessionPool
+from lib.user_cleanup import CreatedUsers
+from lib.timing import RequestTimings
+from lib.transports import Transport, create_transport
 from environment import ENV_OBJECT
 
 class MyRequests:
+    stream_bodies = os.environ.get('HTTP_STREAM_BODIES', '0') == '1'
+    stream_chunk_size = int(os.environ.get('HTTP_STREAM_CHUNK_SIZE', 64 * 1024))
+    stream_memory_limit = int(os.environ.get('HTTP_STREAM_MEMORY_LIMIT', 1024 * 1024))
+    # "requests" or "http2", see lib/transports.py; set_transport() plugs in any other Transport
+    transport_name = os.environ.get('HTTP_TRANSPORT', 'requests')
+
+    _transport = None
+    _transport_lock = threading.Lock()
+
     @staticmethod
     def get(url: str, data: dict = None, headers: dict = None, cookies: dict = None):
-        with allure.step(f"GET request to URL '{url}'"):
+        with AllureSteps.step(f"GET request to URL '{url}'"):
             return MyRequests._send(url, data, headers, cookies, 'GET')
 
     @staticmethod
     def post(url: str, data: dict = None, headers: dict = None, cookies: dict = None):
-        with allure.step(f"POST request to URL '{url}'"):
+        with AllureSteps.step(f"POST request to URL '{url}'"):
           return MyRequests._send(url, data, headers, cookies, 'POST')
 
     @staticmethod
     def put(url: str, data: dict = None, headers: dict = None, cookies: dict = None):
-        with allure.step(f"PUT request to URL '{url}'"):
+        with AllureSteps.step(f"PUT request to URL '{url}'"):
             return MyRequests._send(url, data, headers, cookies, 'PUT')
 
     @staticmethod
     def delete(url: str, data: dict = None, headers: dict = None, cookies: dict = None):
-        with allure.step(f"DELETE request to URL '{url}'"):
+        with AllureSteps.step(f"DELETE request to URL '{url}'"):
             return MyRequests._send(url, data, headers, cookies, 'DELETE')
 
 
+    @classmethod
+    def get_transport(cls):
+        if cls._transport is None:
+            with cls._transport_lock:
+                if cls._transport is None:
+                    cls._transport = create_transport(cls.transport_name)
+        return cls._transport
+
+    @classmethod
+    def set_transport(cls, transport: Transport):
+        cls.close_transport()
+        cls._transport = transport
+
+    @classmethod
+    def close_transport(cls):
+        with cls._transport_lock:
+            transport = cls._transport
+            cls._transport = None
+        if transport is not None:
+            transport.close()
+
+
     @staticmethod
     def _send(url: str, data: dict, headers: dict, cookies: dict, method: str):
 
-        url = f"{ENV_OBJECT.get_base_url()}{url}"
+        base_url = ENV_OBJECT.get_base_url()
+        url = f"{base_url}{url}"
 
         if headers is None:
             headers = {}
         if cookies is None:
             cookies = {}
 
-        Logger.add_request(url, data, headers, cookies, method)
+        Logger.add_request(url, data, headers, cookies, method, base_url)
 
-        if method == "GET":
-            response = requests.get(url, params=data, headers=headers, cookies=cookies)
-        elif method == "POST":
-            response = requests.post(url, data=data, headers=headers, cookies=cookies)
-        elif method == "PUT":
-            response = requests.put(url, data=data, headers=headers, cookies=cookies)
-        elif method == "DELETE":
-            response = requests.delete(url, data=data, headers=headers, cookies=cookies)
+        use_cassette = Cassette.is_enabled()
+        response = None
+        if use_cassette and Cassette.mode == Cassette.REPLAY:
+            response = Cassette.find(method, url, data, headers, cookies)
+
+        if response is not None:
+            response = CachedResponse(response)
         else:
-            raise Exception(f"Bad HTTP method {method} was received")
+            response = MyRequests._send_to_network(base_url, url, data, headers, cookies, method)
+
+            if use_cassette:
+                Cassette.save(method, url, data, headers, cookies, response)
+
+            CreatedUsers.track(method, url[len(base_url):], data, response)
 
+        ResponseComparison.track(method, url[len(base_url):], response)
         Logger.add_response(response)
 
-        return response
\ No newline at end of file
+        return response
+
+
+    @staticmethod
+    def _send_to_network(base_url: str, url: str, data: dict, headers: dict, cookies: dict, method: str):
+        CircuitBreaker.check()
+
+        transport = MyRequests.get_transport()
+        timeout = SessionPool.get_timeout()
+
+        stream = MyRequests.stream_bodies
+        endpoint = RequestTimings.get_endpoint(method, url[len(base_url):])
+        attempt = 0
+        # The total time includes retries and their backoff, measured from the first attempt
+        start = time.perf_counter()
+
+        while True:
+            RetryScheduler.before_request(endpoint)
+            RequestTimings.start_request()
+
+            try:
+                response = transport.send(base_url, method, url, data, headers, cookies, timeout, stream)
+            except Exception as e:
+                if not RetryScheduler.should_retry_error(method, e, attempt):
+                    RetryScheduler.count(endpoint, "failures")
+                    CircuitBreaker.record_failure(url, e)
+                    raise
+                attempt += 1
+                RetryScheduler.wait(endpoint, attempt)
+                continue
+
+            CircuitBreaker.record_success()
+
+            if not RetryScheduler.should_retry_status(endpoint, method, response.status_code, attempt):
+                break
+
+            response.close()
+            attempt += 1
+            RetryScheduler.wait(endpoint, attempt, response.headers.get("Retry-After"))
+
+        body = None
+        if stream:
+            body = StreamedBody(response, MyRequests.stream_chunk_size, MyRequests.stream_memory_limit,
+                                Logger.max_body_length)
+
+        response = CachedResponse(response, body)
+
+        RequestTimings.record(method, url[len(base_url):], response, time.perf_counter() - start, response.body_size)
+
+        return response
+
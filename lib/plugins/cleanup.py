@@ -0,0 +1,50 @@
+import json
+import os
+import pytest
+from lib.cassette import Cassette
+from lib.user_cleanup import CreatedUsers
+
+
+def pytest_configure(config):
+    CreatedUsers.enabled = os.environ.get('CLEANUP_USERS', '1') != '0'
+
+
+@pytest.fixture(scope="session", autouse=True)
+def created_users_session_cleanup(http_session_pool, log_writer):
+    yield
+    # Deletion must really reach the server, even in cassette replay mode
+    Cassette.live = True
+    CreatedUsers.cleanup()
+    Cassette.live = False
+
+
+@pytest.fixture(autouse=True)
+def created_users_cleanup(request):
+    yield
+    live = Cassette.live
+    Cassette.live = True
+    CreatedUsers.cleanup(request.node.nodeid)
+    Cassette.live = live
+
+
+def pytest_sessionfinish(session):
+    if hasattr(session.config, "workerinput"):
+        session.config.workeroutput["failed_user_deletions"] = json.dumps(CreatedUsers.get_failed())
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    failed = getattr(node, "workeroutput", {}).get("failed_user_deletions")
+    if failed:
+        CreatedUsers.add_failed(json.loads(failed))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if hasattr(config, "workerinput") or not CreatedUsers.enabled:
+        return
+
+    failed = CreatedUsers.get_failed()
+    if failed:
+        terminalreporter.section("users not deleted")
+        for user in failed:
+            terminalreporter.write_line(f"{user['user_id']} ({user['email']}, {user.get('env')}): {user['reason']}")
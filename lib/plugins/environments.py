@@ -0,0 +1,78 @@
+import json
+import pytest
+from lib.env_compare import ResponseComparison
+from lib.timing import RequestTimings
+from environment import ENV_OBJECT
+
+
+def pytest_addoption(parser):
+    parser.addoption("--envs", type=lambda value: [env.strip() for env in value.split(",") if env.strip()],
+                     default=None,
+                     help="comma-separated environments (dev, prod, local or base URLs) to run the tests "
+                          "marked 'multi_env' against, use -n to run them concurrently")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "multi_env: read-only or negative test, safe to run against several environments")
+    ResponseComparison.enabled = len(get_envs(config)) > 1
+
+
+def get_envs(config):
+    return config.getoption("--envs", default=None) or []
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_generate_tests(metafunc):
+    # Runs after the other parametrizations, so the environment is the last part of the test id
+    envs = get_envs(metafunc.config)
+    if envs and metafunc.definition.get_closest_marker("multi_env") is not None:
+        metafunc.parametrize("api_environment", envs, indirect=True, ids=envs)
+
+
+def pytest_collection_modifyitems(config, items):
+    # Tests that change data are never run against several environments
+    if not get_envs(config):
+        return
+
+    selected = [item for item in items if item.get_closest_marker("multi_env") is not None]
+    deselected = [item for item in items if item.get_closest_marker("multi_env") is None]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+
+@pytest.fixture(autouse=True)
+def api_environment(request):
+    env = getattr(request, "param", None)
+    if env is None:
+        yield ENV_OBJECT.get_env()
+        return
+
+    # Every environment has its own base URL, so its own pooled sessions, token cache entries and users
+    with ENV_OBJECT.use(env):
+        yield env
+
+
+def pytest_sessionfinish(session):
+    if hasattr(session.config, "workerinput") and ResponseComparison.enabled:
+        session.config.workeroutput["environment_responses"] = json.dumps(ResponseComparison.get_responses())
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    responses = getattr(node, "workeroutput", {}).get("environment_responses")
+    if responses:
+        ResponseComparison.add_responses(json.loads(responses))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    envs = get_envs(config)
+    if hasattr(config, "workerinput") or len(envs) < 2:
+        return
+
+    terminalreporter.section("latency by environment")
+    terminalreporter.write_line(RequestTimings.format_environments(envs))
+
+    differences = ResponseComparison.format_differences(envs)
+    terminalreporter.section("response differences between environments")
+    terminalreporter.write_line(differences or "Responses of all environments have the same status and shape")
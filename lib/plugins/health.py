@@ -0,0 +1,77 @@
+import os
+import pytest
+from lib.cassette import Cassette
+from lib.circuit_breaker import CircuitBreaker
+from lib.my_requests import MyRequests
+from environment import ENV_OBJECT
+
+health_check = os.environ.get('HEALTH_CHECK', '1') != '0'
+health_check_timeout = float(os.environ.get('HEALTH_CHECK_TIMEOUT', 5))
+
+
+def probe(base_url: str):
+    # Any HTTP answer means the API is up, only a failed or hanging connection counts as down.
+    # The probe goes through the configured transport, so it checks the connections the tests will use.
+    transport = MyRequests.get_transport()
+    try:
+        transport.send(base_url, "GET", base_url, None, {}, {}, (health_check_timeout, health_check_timeout),
+                       False).close()
+    except Exception as e:
+        if not CircuitBreaker.is_connection_error(e):
+            raise
+        CircuitBreaker.trip(f"API is unavailable, health check of {base_url} failed: {e}")
+
+
+# Fixtures that need the API, a test using one of them or a BaseCase test talks to the API
+API_FIXTURES = {"shared_user", "shared_users", "fresh_user", "protected_user", "user_pool"}
+
+
+def uses_api(item):
+    from lib.base_case import BaseCase
+    if item.cls is not None and issubclass(item.cls, BaseCase):
+        return True
+    return not API_FIXTURES.isdisjoint(item.fixturenames)
+
+
+@pytest.fixture(scope="session")
+def api_health_check(request, http_session_pool):
+    # A replayed run needs no network
+    if not health_check or Cassette.mode == Cassette.REPLAY:
+        return
+
+    for env in request.config.getoption("--envs", default=None) or [None]:
+        with ENV_OBJECT.use(env):
+            probe(ENV_OBJECT.get_base_url())
+
+
+@pytest.fixture(autouse=True)
+def stop_when_api_is_down(request):
+    # Tests without the API run anyway; the API is probed when the first test that needs it starts
+    if not uses_api(request.node) or Cassette.mode == Cassette.REPLAY:
+        return
+
+    request.getfixturevalue("api_health_check")
+    # The rest of the run would only wait for timeouts: this test fails and the run stops after it
+    if CircuitBreaker.is_open():
+        request.session.shouldstop = CircuitBreaker.get_reason()
+        pytest.fail(CircuitBreaker.get_reason(), pytrace=False)
+
+
+def pytest_sessionfinish(session):
+    if hasattr(session.config, "workerinput") and CircuitBreaker.is_open():
+        session.config.workeroutput["circuit_breaker_reason"] = CircuitBreaker.get_reason()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    reason = getattr(node, "workeroutput", {}).get("circuit_breaker_reason")
+    if reason:
+        CircuitBreaker.trip(reason)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if hasattr(config, "workerinput") or not CircuitBreaker.is_open():
+        return
+
+    terminalreporter.section("circuit breaker")
+    terminalreporter.write_line(CircuitBreaker.get_reason())
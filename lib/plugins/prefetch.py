@@ -0,0 +1,40 @@
+import pytest
+from lib.setup_prefetcher import SetupPrefetcher
+
+next_item_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    parser.addoption("--prefetch-setup", action="store_true", default=False,
+                     help="create users and log in for the next test while the current one runs")
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "needs(*requirements, **counts): setup resources the test uses, "
+        f"one of {', '.join(SetupPrefetcher.REQUIREMENTS)}, e.g. needs(shared_users=2)"
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    # Under xdist nextitem is the next test of this worker, so only its own tests are prefetched
+    item.stash[next_item_key] = nextitem
+
+
+@pytest.fixture(scope="session")
+def setup_prefetcher(request):
+    prefetcher = SetupPrefetcher(enabled=request.config.getoption("--prefetch-setup"))
+    yield prefetcher
+    prefetcher.close()
+
+
+@pytest.fixture(autouse=True)
+def prefetch_next_test_setup(request, setup_prefetcher):
+    next_item = request.node.stash.get(next_item_key, None)
+    if next_item is not None:
+        # A test parametrized with --envs needs its resources in its own environment
+        callspec = getattr(next_item, "callspec", None)
+        env = callspec.params.get("api_environment") if callspec is not None else None
+        setup_prefetcher.prefetch(SetupPrefetcher.get_needs(next_item), env)
@@ -0,0 +1,110 @@
+import glob
+import os
+from collections import Counter
+import pytest
+from lib.allure_steps import AllureSteps
+from lib.logger import Logger, RUN_ID
+from lib.profiling import Profiler, read_collapsed_stacks, write_collapsed_stacks
+from lib.utils import get_worker_id
+
+profiler_key = pytest.StashKey()
+
+_stacks = Counter()
+_stats = []
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("profiling", "per-test profiling")
+    group.addoption("--profile", choices=["all", "marked"], default=None,
+                    help="profile every test that runs (narrow it down with -k) or only tests marked 'profile'")
+    group.addoption("--profile-limit", type=int, default=30,
+                    help="number of functions and allocation sites in the per-test report")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "profile: profile the test when the run has --profile=marked")
+
+
+def is_profiled(item):
+    mode = item.config.getoption("--profile")
+    if mode == "all":
+        return True
+    return mode == "marked" and item.get_closest_marker("profile") is not None
+
+
+def get_file_name(extension: str, worker_id: str = None):
+    worker_id = worker_id or get_worker_id()
+    if worker_id == 'master':
+        return f"{Logger.logs_dir}/profile_{RUN_ID}.{extension}"
+    return f"{Logger.logs_dir}/profile_{RUN_ID}_{worker_id}.{extension}"
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    # Setup is profiled too, that is where users are created and logged in
+    if is_profiled(item):
+        profiler = Profiler()
+        item.stash[profiler_key] = profiler
+        profiler.start()
+    yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    yield
+    finish_profiling(item)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_teardown(item):
+    # The test did not get to the call phase, setup failed or skipped it
+    finish_profiling(item)
+
+
+def finish_profiling(item):
+    profiler = item.stash.get(profiler_key, None)
+    if profiler is None or not profiler.running:
+        return
+
+    profiler.stop()
+
+    limit = item.config.getoption("--profile-limit")
+    AllureSteps.attach_text(profiler.format_hot_functions(limit), "Profile: hot functions")
+    AllureSteps.attach_text(profiler.format_allocations(limit), "Profile: allocations")
+
+    _stacks.update(profiler.get_collapsed_stacks(item.nodeid))
+    _stats.append(profiler.get_stats())
+
+
+def pytest_sessionfinish(session):
+    if not _stats:
+        return
+
+    os.makedirs(Logger.logs_dir, exist_ok=True)
+
+    stats = _stats[0]
+    for other in _stats[1:]:
+        stats.add(other)
+    stats.dump_stats(get_file_name("prof"))
+    write_collapsed_stacks(get_file_name("collapsed"), _stacks)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if hasattr(config, "workerinput") or not config.getoption("--profile"):
+        return
+
+    # Stacks of xdist workers are summed into the file of the whole run
+    file_name = get_file_name("collapsed", 'master')
+    stacks = read_collapsed_stacks(file_name) if os.path.exists(file_name) else Counter()
+    worker_files = glob.glob(get_file_name("collapsed", 'gw*'))
+    for worker_file in worker_files:
+        stacks.update(read_collapsed_stacks(worker_file))
+        os.remove(worker_file)
+    if not stacks:
+        return
+    write_collapsed_stacks(file_name, stacks)
+
+    terminalreporter.section("profiling")
+    terminalreporter.write_line(f"Collapsed stacks for flamegraph.pl or speedscope: {file_name}")
+    for prof_file in sorted(glob.glob(get_file_name("prof", 'master')) + glob.glob(get_file_name("prof", 'gw*'))):
+        terminalreporter.write_line(f"cProfile statistics for snakeviz or pstats: {prof_file}")
@@ -0,0 +1,87 @@
+import pytest
+from lib.duration_db import DurationDatabase
+from lib.plugins.timing import get_test_durations
+
+duration_db_key = pytest.StashKey()
+shard_summary_key = pytest.StashKey()
+
+_failed_tests = set()
+_skipped_tests = set()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("sharding", "duration-aware ordering and sharding")
+    group.addoption("--shards", type=int, default=1,
+                    help="split the selected tests into this many shards of equal expected duration")
+    group.addoption("--shard-id", type=int, default=0, help="shard to run, from 0 to --shards - 1")
+    group.addoption("--longest-first", action="store_true", default=False,
+                    help="run the historically slowest tests first, so xdist workers finish together")
+    group.addoption("--history-failed-first", action="store_true", default=False,
+                    help="run tests that failed in recent runs first")
+
+
+def pytest_configure(config):
+    shards = config.getoption("--shards")
+    shard_id = config.getoption("--shard-id")
+    if shards < 1 or not 0 <= shard_id < shards:
+        raise pytest.UsageError(f"--shard-id must be from 0 to {shards - 1}, --shards must be at least 1")
+
+    config.stash[duration_db_key] = DurationDatabase()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    # Runs after -k and -m, so only the selected tests are balanced
+    db = config.stash[duration_db_key]
+    shards = config.getoption("--shards")
+
+    if shards > 1:
+        shard_id = config.getoption("--shard-id")
+        assignment = db.split([item.nodeid for item in items], shards)
+        selected = [item for item in items if assignment[item.nodeid] == shard_id]
+        deselected = [item for item in items if assignment[item.nodeid] != shard_id]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+        loads = db.get_shard_loads(list(assignment), shards)
+        config.stash[shard_summary_key] = (
+            f"shard {shard_id + 1}/{shards}: {len(selected)} tests, expected {loads[shard_id]:.1f}s "
+            f"(shards {' / '.join(f'{load:.1f}s' for load in loads)})"
+        )
+
+    longest_first = config.getoption("--longest-first")
+    failed_first = config.getoption("--history-failed-first")
+    if longest_first or failed_first:
+        durations = db.get_durations([item.nodeid for item in items]) if longest_first else {}
+        # Sorting is stable, the collection order is kept for equal keys
+        items.sort(key=lambda item: (
+            -db.get_failure_score(item.nodeid) if failed_first else 0,
+            -durations.get(item.nodeid, 0)
+        ))
+
+
+def pytest_report_collectionfinish(config, items):
+    return config.stash.get(shard_summary_key, None)
+
+
+def pytest_runtest_logreport(report):
+    # xdist forwards the reports of its workers, so the controller sees every test;
+    # their durations are collected by lib/plugins/timing.py
+    if report.failed:
+        _failed_tests.add(report.nodeid)
+    if report.skipped:
+        _skipped_tests.add(report.nodeid)
+
+
+def pytest_sessionfinish(session):
+    test_durations = get_test_durations()
+    if hasattr(session.config, "workerinput") or not test_durations:
+        return
+
+    db = session.config.stash[duration_db_key]
+    for nodeid, duration in test_durations.items():
+        # A skipped test took no real time, it would spoil the average
+        if nodeid not in _skipped_tests or nodeid in _failed_tests:
+            db.record(nodeid, duration, nodeid in _failed_tests)
+    db.save()
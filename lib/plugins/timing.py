@@ -0,0 +1,79 @@
+import json
+from collections import defaultdict
+import pytest
+from lib.allure_steps import AllureSteps
+from lib.retry import RetryScheduler
+from lib.timing import RequestTimings
+
+_test_durations = defaultdict(float)
+
+
+def pytest_addoption(parser):
+    parser.addoption("--timings-limit", type=int, default=10,
+                     help="number of slowest tests and endpoints in the request timing report")
+
+
+def pytest_configure(config):
+    RequestTimings.enabled = True
+
+
+@pytest.fixture(autouse=True)
+def request_timings_attachment(request):
+    yield
+    records = RequestTimings.get_records(request.node.nodeid)
+    if records:
+        AllureSteps.attach_text(RequestTimings.format_records(records), "Request timings")
+
+
+def get_test_durations():
+    # Setup, call and teardown of every test, lib/plugins/sharding.py stores them in the duration database
+    return dict(_test_durations)
+
+
+def pytest_runtest_logreport(report):
+    _test_durations[report.nodeid] += report.duration
+
+
+def pytest_sessionfinish(session):
+    if hasattr(session.config, "workerinput"):
+        session.config.workeroutput["request_timings"] = json.dumps(RequestTimings.get_records())
+        session.config.workeroutput["request_counters"] = json.dumps(RetryScheduler.get_counters())
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    records = getattr(node, "workeroutput", {}).get("request_timings")
+    if records:
+        RequestTimings.add_records(json.loads(records))
+
+    counters = getattr(node, "workeroutput", {}).get("request_counters")
+    if counters:
+        RetryScheduler.add_counters(json.loads(counters))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if hasattr(config, "workerinput") or not RequestTimings.get_records():
+        return
+
+    limit = config.getoption("--timings-limit")
+
+    terminalreporter.section("slowest endpoints")
+    terminalreporter.write_line(RequestTimings.format_endpoints(limit))
+
+    terminalreporter.section("slowest tests")
+    terminalreporter.write_line(f"{'Duration, s':>12}{'Network, s':>12}{'Requests':>10}  Test")
+    network_by_test = {row["test"]: row for row in RequestTimings.by_test()}
+    slowest = sorted(_test_durations.items(), key=lambda item: item[1], reverse=True)[:limit]
+    for nodeid, duration in slowest:
+        row = network_by_test.get(nodeid, {"network": 0.0, "count": 0})
+        terminalreporter.write_line(f"{duration:>12.2f}{row['network']:>12.2f}{row['count']:>10}  {nodeid}")
+
+    counters = RetryScheduler.get_counters()
+    if any(values.get("retries") or values.get("throttled") or values.get("failures") for values in counters.values()):
+        terminalreporter.section("request retries and throttling")
+        terminalreporter.write_line(f"{'Endpoint':<24}{'Requests':>10}{'Retries':>9}{'Failures':>10}{'Throttled':>11}{'Wait, s':>9}")
+        for endpoint, values in sorted(counters.items()):
+            terminalreporter.write_line(
+                f"{endpoint:<24}{values.get('requests', 0):>10.0f}{values.get('retries', 0):>9.0f}"
+                f"{values.get('failures', 0):>10.0f}{values.get('throttled', 0):>11.0f}{values.get('throttle_wait', 0):>9.2f}"
+            )
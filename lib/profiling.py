@@ -0,0 +1,112 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+
+
+class StackSampler:
+    # Samples the stack of one thread, the counts are in the collapsed format of flamegraph.pl and speedscope
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+
+class Profiler:
+    sample_interval = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', 0.001))
+    traceback_limit = int(os.environ.get('PROFILE_TRACEBACK_LIMIT', 10))
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident(), self.sample_interval)
+        self.running = False
+        self.peak_memory = 0
+        self.snapshot = None
+        self._owns_tracemalloc = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_limit)
+            self._owns_tracemalloc = True
+        tracemalloc.reset_peak()
+
+        self.sampler.start()
+        self.profile.enable()
+        self.running = True
+
+    def stop(self):
+        if not self.running:
+            return
+
+        self.profile.disable()
+        self.sampler.stop()
+        self.running = False
+
+        self.peak_memory = tracemalloc.get_traced_memory()[1]
+        self.snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")
+        ])
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+
+    def get_stats(self):
+        return pstats.Stats(self.profile)
+
+    def format_hot_functions(self, limit: int):
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+    def format_allocations(self, limit: int):
+        lines = [f"Peak traced memory: {self.peak_memory / 1024:.1f} KiB", ""]
+        for statistic in self.snapshot.statistics("lineno")[:limit]:
+            frame = statistic.traceback[0]
+            lines.append(f"{statistic.size / 1024:>10.1f} KiB {statistic.count:>8} blocks  {frame.filename}:{frame.lineno}")
+        return "\n".join(lines)
+
+    def get_collapsed_stacks(self, root: str):
+        # The test is the root frame, so one flame graph shows the whole session
+        return Counter({f"{root};{stack}": count for stack, count in self.sampler.stacks.items()})
+
+
+def write_collapsed_stacks(file_name: str, stacks: Counter):
+    with open(file_name, 'w', encoding='utf-8') as stacks_file:
+        for stack, count in sorted(stacks.items()):
+            stacks_file.write(f"{stack} {count}\n")
+
+
+def read_collapsed_stacks(file_name: str):
+    stacks = Counter()
+    with open(file_name, encoding='utf-8') as stacks_file:
+        for line in stacks_file:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] += int(count)
+    return stacks
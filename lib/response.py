@@ -0,0 +1,121 @@
+from __future__ import annotations
+import hashlib
+import json
+import tempfile
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from requests import Response
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+class StreamedBody:
+    # Reads a streamed body in chunks: small bodies stay in memory, large ones are spooled to disk
+    def __init__(self, response: Response, chunk_size: int, memory_limit: int, preview_size: int):
+        self.size = 0
+        self.preview = b''
+        self._sha256 = hashlib.sha256()
+        self._spool = tempfile.SpooledTemporaryFile(max_size=memory_limit)
+
+        try:
+            for chunk in response.iter_content(chunk_size):
+                self.size += len(chunk)
+                self._sha256.update(chunk)
+                self._spool.write(chunk)
+                if len(self.preview) < preview_size:
+                    self.preview += chunk[:preview_size - len(self.preview)]
+        finally:
+            response.close()
+
+    @property
+    def sha256(self):
+        return self._sha256.hexdigest()
+
+    def read(self):
+        self._spool.seek(0)
+        data = self._spool.read()
+        self._spool.close()
+        return data
+
+
+class CachedResponse:
+    _NOT_PARSED = object()
+
+    def __init__(self, response: Response, body: StreamedBody = None):
+        self._response = response
+        self._body = body
+        self._json = self._NOT_PARSED
+        self._json_error = None
+
+    @property
+    def raw_response(self):
+        self._materialize()
+        return self._response
+
+    @property
+    def content(self):
+        self._materialize()
+        return self._response.content
+
+    @property
+    def text(self):
+        self._materialize()
+        return self._response.text
+
+    @property
+    def body_size(self):
+        if self._body is not None:
+            return self._body.size
+        return len(self._response.content)
+
+    def _materialize(self):
+        if self._body is not None:
+            self._response._content = self._body.read()
+            self._body = None
+
+    def get_log_body(self, max_length: int):
+        # 0 means no truncation, a streamed body is then read back in full like any other
+        if self._body is not None and max_length:
+            encoding = self._response.encoding or 'utf-8'
+            preview = self._body.preview.decode(encoding, errors='replace')
+            if self._body.size == len(self._body.preview):
+                return preview
+            return f"{preview}... [streamed {self._body.size} bytes, sha256 {self._body.sha256}]"
+
+        text = self.text
+        if max_length and len(text) > max_length:
+            return f"{text[:max_length]}... [truncated {len(text) - max_length} chars]"
+        return text
+
+    def json(self, **kwargs):
+        if kwargs:
+            return self._response.json(**kwargs)
+
+        if self._json_error is not None:
+            raise self._json_error
+
+        if self._json is self._NOT_PARSED:
+            try:
+                self._json = _loads(self.content)
+            except ValueError as e:
+                self._json_error = json.JSONDecodeError(str(e), self.text, 0)
+                raise self._json_error
+
+        return self._json
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def __bool__(self):
+        return bool(self._response)
+
+    def __iter__(self):
+        return iter(self.raw_response)
+
+    def __repr__(self):
+        return repr(self._response)
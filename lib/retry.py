@@ -0,0 +1,133 @@
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+
+
+class TokenBucket:
+    # AIMD: the rate is halved on 429 and grows back by a small step after every successful request
+    def __init__(self, rate: float, burst: float = None, min_rate: float = 1.0):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate) if rate else 0
+        self.capacity = burst if burst is not None else max(rate, 1)
+        self.tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.max_rate:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self.tokens -= 1
+            # A negative balance is the queue of callers that already took a future token
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def on_throttled(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class RetryScheduler:
+    IDEMPOTENT_METHODS = {"GET", "DELETE"}
+    RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+    max_retries = int(os.environ.get('HTTP_MAX_RETRIES', 3))
+    backoff_factor = float(os.environ.get('HTTP_BACKOFF_FACTOR', 0.3))
+    max_backoff = float(os.environ.get('HTTP_MAX_BACKOFF', 10))
+
+    # The limit is for the whole run, so every xdist worker takes its share of it
+    rate_limiter = TokenBucket(
+        float(os.environ.get('HTTP_RATE_LIMIT', 0)) / int(os.environ.get('PYTEST_XDIST_WORKER_COUNT', 1))
+    )
+
+    _counters = defaultdict(lambda: defaultdict(float))
+    _lock = threading.Lock()
+
+    @classmethod
+    def count(cls, endpoint: str, name: str, value: float = 1):
+        with cls._lock:
+            cls._counters[endpoint][name] += value
+
+    @classmethod
+    def get_counters(cls):
+        with cls._lock:
+            return {endpoint: dict(counters) for endpoint, counters in cls._counters.items()}
+
+    @classmethod
+    def add_counters(cls, counters: dict):
+        for endpoint, values in counters.items():
+            for name, value in values.items():
+                cls.count(endpoint, name, value)
+
+    @classmethod
+    def before_request(cls, endpoint: str):
+        cls.count(endpoint, "requests")
+        delay = cls.rate_limiter.acquire()
+        if delay:
+            cls.count(endpoint, "throttled")
+            cls.count(endpoint, "throttle_wait", delay)
+
+    @staticmethod
+    def is_connect_error(error: Exception):
+        # Failed before the request was sent, so even POST and PUT can be repeated safely
+        import requests
+        from urllib3.exceptions import NewConnectionError
+
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+            return isinstance(getattr(error.args[0], 'reason', None), NewConnectionError)
+        return False
+
+    @classmethod
+    def should_retry_error(cls, method: str, error: Exception, attempt: int):
+        import requests
+
+        if attempt >= cls.max_retries or not isinstance(error, requests.exceptions.RequestException):
+            return False
+        if method in cls.IDEMPOTENT_METHODS:
+            return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+        return cls.is_connect_error(error)
+
+    @classmethod
+    def should_retry_status(cls, endpoint: str, method: str, status_code: int, attempt: int):
+        # Only an answer below 500 is a success, the rate does not grow back while the server fails
+        if status_code == 429:
+            cls.rate_limiter.on_throttled()
+        elif status_code < 500:
+            cls.rate_limiter.on_success()
+
+        if status_code not in cls.RETRY_STATUS_CODES:
+            return False
+
+        # 429 means the server rejected the request without handling it
+        if attempt < cls.max_retries and (method in cls.IDEMPOTENT_METHODS or status_code == 429):
+            return True
+
+        # The last answer is still a temporary failure, it goes to the caller as is
+        cls.count(endpoint, "failures")
+        return False
+
+    @classmethod
+    def wait(cls, endpoint: str, attempt: int, retry_after: str = None):
+        cls.count(endpoint, "retries")
+
+        delay = random.uniform(0, min(cls.max_backoff, cls.backoff_factor * 2 ** attempt))
+        if retry_after is not None and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), cls.max_backoff))
+
+        time.sleep(delay)
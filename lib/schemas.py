@@ -0,0 +1,76 @@
+ID_TYPES = (int, str)
+
+# (endpoint, auth state) -> expected status, required keys with types, keys that must be absent
+USER_API_SCHEMAS = {
+    ("POST /user/", "created"): {
+        "status": 200,
+        "required": {"id": ID_TYPES}
+    },
+    ("POST /user/login", "logged_in"): {
+        "status": 200,
+        "required": {"user_id": int}
+    },
+    ("GET /user/auth", "authorized"): {
+        "status": 200,
+        "required": {"user_id": int}
+    },
+    ("GET /user/{id}", "same_user"): {
+        "status": 200,
+        "required": {"username": str, "email": str, "firstName": str, "lastName": str}
+    },
+    ("GET /user/{id}", "not_same_user"): {
+        "status": 200,
+        "required": {"username": str},
+        "forbidden": ["email", "firstName", "lastName"]
+    },
+    ("PUT /user/{id}", "updated"): {
+        "status": 200,
+        "required": {"success": str}
+    },
+    ("PUT /user/{id}", "rejected"): {
+        "status": 400,
+        "required": {"error": str}
+    },
+    ("DELETE /user/{id}", "deleted"): {
+        "status": 200,
+        "required": {"success": str}
+    },
+    ("DELETE /user/{id}", "rejected"): {
+        "status": 400,
+        "required": {"error": str}
+    }
+}
+
+
+def compile_schema(schema: dict):
+    expected_status = schema.get("status")
+    required = tuple(schema.get("required", {}).items())
+    forbidden = tuple(schema.get("forbidden", ()))
+
+    def validate(status_code, body):
+        errors = []
+
+        if expected_status is not None and status_code != expected_status:
+            errors.append(f"Unexpected status code! Expected: {expected_status}. Actual: {status_code}")
+
+        if not isinstance(body, dict):
+            errors.append(f"Response JSON is not an object: {body!r}")
+            return errors
+
+        for name, expected_type in required:
+            if name not in body:
+                errors.append(f"Response JSON does not have key '{name}'")
+            elif not isinstance(body[name], expected_type) or isinstance(body[name], bool):
+                errors.append(f"Key '{name}' has unexpected type {type(body[name]).__name__}")
+
+        for name in forbidden:
+            if name in body:
+                errors.append(f"Response JSON should not have key '{name}', but it is present")
+
+        return errors
+
+    return validate
+
+
+# Compiled once at import, assertions only call the ready functions
+VALIDATORS = {key: compile_schema(schema) for key, schema in USER_API_SCHEMAS.items()}
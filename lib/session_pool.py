@@ -0,0 +1,57 @@
+import os
+import threading
+
+
+class SessionPool:
+    pool_size = int(os.environ.get('HTTP_POOL_SIZE', 10))
+    connect_timeout = float(os.environ.get('HTTP_CONNECT_TIMEOUT', 5))
+    read_timeout = float(os.environ.get('HTTP_READ_TIMEOUT', 30))
+    keep_alive = os.environ.get('HTTP_KEEP_ALIVE', '1') != '0'
+
+    _sessions = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls, base_url: str):
+        # requests.Session is not thread-safe, so every worker process and thread gets its own
+        key = (os.getpid(), threading.get_ident(), base_url)
+
+        session = cls._sessions.get(key)
+        if session is None:
+            with cls._lock:
+                session = cls._sessions.get(key)
+                if session is None:
+                    session = cls._create_session(base_url)
+                    cls._sessions[key] = session
+
+        return session
+
+    @classmethod
+    def get_timeout(cls):
+        return cls.connect_timeout, cls.read_timeout
+
+    @classmethod
+    def _create_session(cls, base_url: str):
+        # requests and urllib3 are imported on the first request, not while pytest collects tests
+        import requests
+        from urllib3.util.retry import Retry
+        from lib.timed_adapter import NoCookiePolicy, TimedHTTPAdapter
+
+        # Retries are scheduled by MyRequests through RetryScheduler
+        adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=cls.pool_size, max_retries=Retry(0, read=False))
+
+        session = requests.Session()
+        session.mount(base_url, adapter)
+        session.cookies.set_policy(NoCookiePolicy())
+        session.headers['Connection'] = 'keep-alive' if cls.keep_alive else 'close'
+
+        return session
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            sessions = list(cls._sessions.values())
+            cls._sessions.clear()
+
+        for session in sessions:
+            session.close()
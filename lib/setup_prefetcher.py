@@ -0,0 +1,122 @@
+import os
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from lib.allure_steps import AllureSteps
+from lib.cassette import Cassette
+from lib.timing import RequestTimings
+from lib.user_cleanup import CreatedUsers
+from lib.user_pool import UserPool
+from environment import ENV_OBJECT
+
+
+class SetupPrefetcher:
+    FRESH_USER = 'fresh_user'
+    SHARED_USER = 'shared_user'
+    SHARED_USERS = 'shared_users'
+    PROTECTED_USER = 'protected_user'
+
+    REQUIREMENTS = [FRESH_USER, SHARED_USER, SHARED_USERS, PROTECTED_USER]
+
+    # Requests made ahead of time are logged and timed under this name, not under the running test
+    TEST_NAME = 'setup-prefetch'
+
+    max_workers = int(os.environ.get('SETUP_PREFETCH_WORKERS', 4))
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        # Everything is kept per environment, users of one do not exist in another
+        self._fresh_users = defaultdict(deque)
+        self._shared_pending = defaultdict(int)
+        self._protected = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_needs(cls, item):
+        # Requirements come from the setup fixtures a test uses, @pytest.mark.needs adds or overrides counts
+        needs = {name: 1 for name in cls.REQUIREMENTS if name in item.fixturenames}
+
+        for marker in item.iter_markers("needs"):
+            for name in marker.args:
+                needs.setdefault(name, 1)
+            needs.update(marker.kwargs)
+
+        unknown = set(needs) - set(cls.REQUIREMENTS)
+        if unknown:
+            raise ValueError(f"Unknown setup requirements {sorted(unknown)} in {item.nodeid}")
+
+        return needs
+
+    def prefetch(self, needs: dict, env: str = None):
+        if not self.enabled or not needs:
+            return
+
+        env = env or ENV_OBJECT.get_env()
+        user_pool = UserPool.for_environment(env)
+
+        with self._lock:
+            for _ in range(needs.get(self.FRESH_USER, 0)):
+                self._fresh_users[env].append(self._submit(env, user_pool.create))
+
+            shared = max(needs.get(self.SHARED_USER, 0), needs.get(self.SHARED_USERS, 0))
+            missing = shared - user_pool.idle_count() - self._shared_pending[env]
+            for _ in range(missing):
+                self._shared_pending[env] += 1
+                self._submit(env, self._create_shared_user, env, user_pool)
+
+            if needs.get(self.PROTECTED_USER) and env not in self._protected:
+                self._protected[env] = self._submit(env, user_pool.get_protected_account)
+
+    def take_fresh_user(self):
+        env = ENV_OBJECT.get_env()
+        with self._lock:
+            fresh_users = self._fresh_users[env]
+            future = fresh_users.popleft() if fresh_users else None
+
+        if future is not None:
+            try:
+                user_data = future.result()
+            except Exception:
+                # The test still gets its user, created the usual way
+                user_data = None
+
+            if user_data is not None:
+                CreatedUsers.assign(user_data["user_id"], RequestTimings.get_test_name())
+                return user_data
+
+        return UserPool.for_environment(env).create()
+
+    def close(self):
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            self._fresh_users.clear()
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _create_shared_user(self, env: str, user_pool: UserPool):
+        try:
+            user_pool.checkin(user_pool.create())
+        finally:
+            with self._lock:
+                self._shared_pending[env] -= 1
+
+    def _submit(self, env: str, function, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="setup-prefetch",
+                                                initializer=self._init_thread)
+
+        def run():
+            with ENV_OBJECT.use(env):
+                return function(*args)
+
+        return self._executor.submit(run)
+
+    @classmethod
+    def _init_thread(cls):
+        # Prefetched users must really exist on the server and belong to no test until they are taken
+        Cassette.set_thread_live(True)
+        AllureSteps.set_thread_enabled(False)
+        RequestTimings.set_thread_test_name(cls.TEST_NAME)
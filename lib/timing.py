@@ -0,0 +1,185 @@
+import os
+import re
+import threading
+from collections import defaultdict, deque
+from lib.utils import percentile
+from environment import ENV_OBJECT
+
+
+class RequestTimings:
+    # Switched on by lib/plugins/timing.py, a load run outside pytest keeps no records
+    enabled = False
+    # The oldest records are dropped beyond this, so a long session stays within bounded memory
+    max_records = int(os.environ.get('TIMING_MAX_RECORDS', 100000))
+
+    _local = threading.local()
+    _records = deque(maxlen=max_records)
+    _lock = threading.Lock()
+
+    @classmethod
+    def start_request(cls):
+        cls._local.connect_time = 0.0
+
+    @classmethod
+    def add_connect_time(cls, elapsed: float):
+        # Called from the connection on a new socket: DNS lookup, TCP and TLS handshakes
+        cls._local.connect_time = getattr(cls._local, 'connect_time', 0.0) + elapsed
+
+    @staticmethod
+    def get_endpoint(method: str, url: str):
+        path = url.split('?', 1)[0]
+        return f"{method} {re.sub(r'/[0-9]+(?=/|$)', '/{id}', path)}"
+
+    @classmethod
+    def set_thread_test_name(cls, test_name: str):
+        # Requests from background threads are attributed to this name instead of the running test
+        cls._local.test_name = test_name
+
+    @classmethod
+    def get_test_name(cls):
+        test_name = getattr(cls._local, 'test_name', None)
+        if test_name is not None:
+            return test_name
+
+        testname = os.environ.get('PYTEST_CURRENT_TEST')
+        if testname is None:
+            return None
+        # "tests/test_a.py::test_b (call)" -> "tests/test_a.py::test_b"
+        return testname.rsplit(' ', 1)[0]
+
+    @classmethod
+    def get_test_phase(cls):
+        # "setup", "call" or "teardown", None outside of a test and in background threads
+        if getattr(cls._local, 'test_name', None) is not None:
+            return None
+
+        testname = os.environ.get('PYTEST_CURRENT_TEST')
+        if testname is None:
+            return None
+        return testname.rsplit(' ', 1)[-1].strip('()')
+
+    @classmethod
+    def record(cls, method: str, url: str, response, total_time: float, response_bytes: int = None):
+        request_body = response.request.body if response.request is not None else None
+
+        record = {
+            "test": cls.get_test_name(),
+            "env": ENV_OBJECT.get_env(),
+            "endpoint": cls.get_endpoint(method, url),
+            "status": response.status_code,
+            "connect": getattr(cls._local, 'connect_time', 0.0),
+            "ttfb": response.elapsed.total_seconds(),
+            "total": total_time,
+            "request_bytes": len(request_body) if request_body else 0,
+            "response_bytes": len(response.content) if response_bytes is None else response_bytes
+        }
+
+        if cls.enabled:
+            with cls._lock:
+                cls._records.append(record)
+
+        return record
+
+    @classmethod
+    def get_records(cls, test: str = None):
+        with cls._lock:
+            if test is None:
+                return list(cls._records)
+            return [record for record in cls._records if record["test"] == test]
+
+    @classmethod
+    def add_records(cls, records: list):
+        with cls._lock:
+            cls._records.extend(records)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._records.clear()
+
+    @classmethod
+    def by_endpoint(cls):
+        grouped = defaultdict(list)
+        for record in cls.get_records():
+            grouped[record["endpoint"]].append(record)
+
+        rows = []
+        for endpoint, records in grouped.items():
+            totals = [record["total"] for record in records]
+            rows.append({
+                "endpoint": endpoint,
+                "count": len(records),
+                "mean": sum(totals) / len(totals),
+                "p95": percentile(totals, 95),
+                "max": max(totals),
+                "ttfb": sum(record["ttfb"] for record in records) / len(records),
+                "connect": sum(record["connect"] for record in records) / len(records),
+                "bytes": sum(record["response_bytes"] for record in records)
+            })
+
+        return sorted(rows, key=lambda row: row["mean"], reverse=True)
+
+    @classmethod
+    def by_test(cls):
+        grouped = defaultdict(list)
+        for record in cls.get_records():
+            if record["test"] is not None:
+                grouped[record["test"]].append(record)
+
+        rows = [{
+            "test": test,
+            "count": len(records),
+            "network": sum(record["total"] for record in records)
+        } for test, records in grouped.items()]
+
+        return sorted(rows, key=lambda row: row["network"], reverse=True)
+
+    @staticmethod
+    def format_records(records: list):
+        lines = [f"{'Endpoint':<24}{'Status':>7}{'Connect, ms':>13}{'TTFB, ms':>10}{'Total, ms':>11}{'Sent, B':>9}{'Received, B':>13}"]
+        for record in records:
+            lines.append(
+                f"{record['endpoint']:<24}{record['status']:>7}{record['connect'] * 1000:>13.1f}"
+                f"{record['ttfb'] * 1000:>10.1f}{record['total'] * 1000:>11.1f}"
+                f"{record['request_bytes']:>9}{record['response_bytes']:>13}"
+            )
+        return "\n".join(lines)
+
+    @classmethod
+    def format_endpoints(cls, limit: int = 10):
+        lines = [f"{'Endpoint':<24}{'Count':>7}{'Mean, ms':>10}{'p95, ms':>9}{'Max, ms':>9}{'TTFB, ms':>10}{'Connect, ms':>13}"]
+        for row in cls.by_endpoint()[:limit]:
+            lines.append(
+                f"{row['endpoint']:<24}{row['count']:>7}{row['mean'] * 1000:>10.1f}{row['p95'] * 1000:>9.1f}"
+                f"{row['max'] * 1000:>9.1f}{row['ttfb'] * 1000:>10.1f}{row['connect'] * 1000:>13.1f}"
+            )
+        return "\n".join(lines)
+
+    @classmethod
+    def by_endpoint_and_env(cls):
+        grouped = defaultdict(list)
+        for record in cls.get_records():
+            grouped[record["endpoint"], record.get("env")].append(record["total"])
+
+        rows = {}
+        for (endpoint, env), totals in grouped.items():
+            rows.setdefault(endpoint, {})[env] = {
+                "count": len(totals),
+                "median": percentile(totals, 50),
+                "p95": percentile(totals, 95)
+            }
+        return rows
+
+    @classmethod
+    def format_environments(cls, envs: list):
+        # Every environment gets median and p95 columns, the endpoints are side by side
+        header = f"{'Endpoint':<24}" + "".join(f"{env[-24:] + ' median/p95, ms':>42}" for env in envs)
+        lines = [header]
+        for endpoint, by_env in sorted(cls.by_endpoint_and_env().items()):
+            line = f"{endpoint:<24}"
+            for env in envs:
+                row = by_env.get(env)
+                cell = f"{row['median'] * 1000:.1f} / {row['p95'] * 1000:.1f} ({row['count']})" if row else "-"
+                line += f"{cell:>42}"
+            lines.append(line)
+        return "\n".join(lines)
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from environment import ENV_OBJECT
+
+
+class TokenCache:
+    # Sessions younger than this are used without any check
+    trust_time = float(os.environ.get('TOKEN_CACHE_TRUST_TIME', 300))
+    # Older sessions are checked with /user/auth, after this age they are not even tried
+    ttl = float(os.environ.get('TOKEN_CACHE_TTL', 3600))
+    # Empty value keeps the cache in memory only
+    file_name = os.environ.get('TOKEN_CACHE_FILE', '')
+
+    _entries = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def make_key(email: str, password: str):
+        # The password is never stored, only a hash of the credential pair
+        credentials = f"{ENV_OBJECT.get_base_url()} {email} {password}"
+        return hashlib.sha256(credentials.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def _load(cls):
+        if cls._entries is None:
+            cls._entries = {}
+            if cls.file_name and os.path.exists(cls.file_name):
+                try:
+                    with open(cls.file_name, encoding='utf-8') as cache_file:
+                        cls._entries = json.load(cache_file)
+                except (OSError, ValueError):
+                    cls._entries = {}
+        return cls._entries
+
+    @classmethod
+    def _save(cls):
+        if not cls.file_name:
+            return
+
+        directory = os.path.dirname(cls.file_name)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Written to a temporary file first, xdist workers may read the cache at the same time
+        temp_file_name = f"{cls.file_name}.{os.getpid()}.tmp"
+        with open(temp_file_name, 'w', encoding='utf-8') as cache_file:
+            json.dump(cls._entries, cache_file)
+        os.replace(temp_file_name, cls.file_name)
+
+    @classmethod
+    def get(cls, base_case, email: str, password: str):
+        key = cls.make_key(email, password)
+
+        with cls._lock:
+            entry = cls._load().get(key)
+
+        now = time.time()
+        if entry is not None:
+            age = now - entry["checked_at"]
+            if age < cls.trust_time:
+                return cls._to_user_data(entry, email, password)
+
+            if now - entry["logged_in_at"] < cls.ttl and base_case.is_logged_in(cls._to_user_data(entry, email, password)):
+                entry["checked_at"] = now
+                cls._store(key, entry)
+                return cls._to_user_data(entry, email, password)
+
+        user_data = base_case.login(email, password)
+        cls._store(key, {
+            "email": email,
+            "user_id": user_data["user_id"],
+            "auth_sid": user_data["auth_sid"],
+            "token": user_data["token"],
+            "logged_in_at": now,
+            "checked_at": now
+        })
+        return user_data
+
+    @classmethod
+    def _store(cls, key: str, entry: dict):
+        with cls._lock:
+            cls._load()[key] = entry
+            cls._save()
+
+    @staticmethod
+    def _to_user_data(entry: dict, email: str, password: str):
+        return {
+            "password": password,
+            "email": email,
+            "user_id": entry["user_id"],
+            "auth_sid": entry["auth_sid"],
+            "token": entry["token"]
+        }
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._entries = {}
+            if cls.file_name and os.path.exists(cls.file_name):
+                os.remove(cls.file_name)
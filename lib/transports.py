@@ -0,0 +1,190 @@
+import datetime
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from lib.session_pool import SessionPool
+from lib.timing import RequestTimings
+
+_connect = threading.local()
+
+
+class Transport(ABC):
+    # Sends one request and returns a requests.Response, so everything above MyRequests stays the same
+    name = None
+
+    @abstractmethod
+    def send(self, base_url: str, method: str, url: str, data: dict, headers: dict, cookies: dict, timeout,
+             stream: bool):
+        pass
+
+    def close(self):
+        pass
+
+
+class RequestsTransport(Transport):
+    name = 'requests'
+
+    def send(self, base_url: str, method: str, url: str, data: dict, headers: dict, cookies: dict, timeout,
+             stream: bool):
+        session = SessionPool.get_session(base_url)
+
+        if method == "GET":
+            return session.get(url, params=data, headers=headers, cookies=cookies, timeout=timeout, stream=stream)
+        elif method == "POST":
+            return session.post(url, data=data, headers=headers, cookies=cookies, timeout=timeout, stream=stream)
+        elif method == "PUT":
+            return session.put(url, data=data, headers=headers, cookies=cookies, timeout=timeout, stream=stream)
+        elif method == "DELETE":
+            return session.delete(url, data=data, headers=headers, cookies=cookies, timeout=timeout, stream=stream)
+        else:
+            raise Exception(f"Bad HTTP method {method} was received")
+
+    def close(self):
+        SessionPool.close_all()
+
+
+class Http2Transport(Transport):
+    # httpx with HTTP/2 is an optional dependency: pip install "httpx[http2]"
+    # One client per process and base URL is shared by all threads, their requests are multiplexed
+    # over a few connections. Over plain http httpx falls back to HTTP/1.1.
+    name = 'http2'
+
+    max_connections = int(os.environ.get('HTTP2_MAX_CONNECTIONS', SessionPool.pool_size))
+
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def _get_client(self, base_url: str):
+        key = (os.getpid(), base_url)
+
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    try:
+                        import httpx
+                    except ImportError:
+                        raise ImportError('HTTP_TRANSPORT=http2 needs httpx, install it with pip install "httpx[http2]"')
+                    from http.cookiejar import CookieJar
+                    from lib.timed_adapter import NoCookiePolicy
+
+                    limits = httpx.Limits(max_connections=self.max_connections,
+                                          max_keepalive_connections=self.max_connections if SessionPool.keep_alive else 0)
+                    # Like the pooled sessions of requests, the shared client never keeps cookies
+                    client = httpx.Client(http2=True, limits=limits, cookies=CookieJar(policy=NoCookiePolicy()))
+                    self._clients[key] = client
+
+        return client
+
+    def send(self, base_url: str, method: str, url: str, data: dict, headers: dict, cookies: dict, timeout,
+             stream: bool):
+        import httpx
+
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            raise Exception(f"Bad HTTP method {method} was received")
+
+        client = self._get_client(base_url)
+        connect_timeout, read_timeout = timeout
+
+        headers = dict(headers)
+        if cookies:
+            headers["Cookie"] = "; ".join(f"{name}={value}" for name, value in cookies.items())
+
+        request = client.build_request(
+            method, url,
+            params=data if method == "GET" else None,
+            data=data if method != "GET" else None,
+            headers=headers,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            extensions={"trace": self._trace}
+        )
+
+        try:
+            response = client.send(request)
+        except httpx.TransportError as e:
+            raise self._convert_error(e, url) from e
+
+        return self._to_requests_response(response)
+
+    def close(self):
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+
+        for client in clients:
+            client.close()
+
+    @staticmethod
+    def _trace(event_name: str, info: dict):
+        # httpcore reports connection steps, the time of TCP connect and TLS handshake is added like in requests
+        if event_name in ("connection.connect_tcp.started", "connection.start_tls.started"):
+            _connect.started = time.perf_counter()
+        elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            started = getattr(_connect, 'started', None)
+            if started is not None:
+                RequestTimings.add_connect_time(time.perf_counter() - started)
+                _connect.started = None
+
+    @staticmethod
+    def _convert_error(error: Exception, url: str):
+        # RetryScheduler and CircuitBreaker know the exceptions of requests, they get the same ones
+        import httpx
+        import requests
+        from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+        if isinstance(error, httpx.ConnectTimeout):
+            return requests.exceptions.ConnectTimeout(str(error))
+        if isinstance(error, httpx.ConnectError):
+            return requests.exceptions.ConnectionError(MaxRetryError(None, url, NewConnectionError(None, str(error))))
+        if isinstance(error, httpx.TimeoutException):
+            return requests.exceptions.ReadTimeout(str(error))
+        return requests.exceptions.ConnectionError(str(error))
+
+    @staticmethod
+    def _to_requests_response(response):
+        import requests
+        from requests.cookies import RequestsCookieJar
+        from requests.structures import CaseInsensitiveDict
+
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.reason = response.reason_phrase
+        result.url = str(response.url)
+        result.headers = CaseInsensitiveDict()
+        for name, value in response.headers.multi_items():
+            # Repeated headers are joined like urllib3 does
+            result.headers[name] = f"{result.headers[name]}, {value}" if name in result.headers else value
+        result.encoding = response.encoding
+        result._content = response.content
+        # The body is already read, a streamed read in MyRequests gets it in chunks from memory
+        result._content_consumed = True
+        result.elapsed = response.elapsed if response.elapsed is not None else datetime.timedelta()
+
+        result.cookies = RequestsCookieJar()
+        for cookie in response.cookies.jar:
+            result.cookies.set_cookie(cookie)
+
+        prepared = requests.PreparedRequest()
+        prepared.method = response.request.method
+        prepared.url = str(response.request.url)
+        prepared.headers = CaseInsensitiveDict(response.request.headers.multi_items())
+        prepared.body = response.request.content or None
+        result.request = prepared
+
+        return result
+
+
+TRANSPORTS = {
+    RequestsTransport.name: RequestsTransport,
+    Http2Transport.name: Http2Transport
+}
+
+
+def create_transport(name: str):
+    transport_class = TRANSPORTS.get(name)
+    if transport_class is None:
+        raise Exception(f"Unknown HTTP transport {name}, expected one of {', '.join(TRANSPORTS)}")
+    return transport_class()
@@ -0,0 +1,147 @@
+import os
+import re
+import threading
+from lib.timing import RequestTimings
+from environment import ENV_OBJECT
+
+
+class CreatedUsers:
+    # Switched on by lib/plugins/cleanup.py: outside pytest nobody deletes the tracked users
+    enabled = False
+    batch_size = int(os.environ.get('CLEANUP_BATCH_SIZE', 20))
+
+    user_path = re.compile(r'^/user/(\d+)$')
+
+    _users = {}
+    _kept = set()
+    _failed = []
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _key(user_id, env: str = None):
+        # Ids are only unique within one environment
+        return env or ENV_OBJECT.get_env(), str(user_id)
+
+    @classmethod
+    def track(cls, method: str, path: str, data: dict, response):
+        if not cls.enabled or response.status_code != 200:
+            return
+
+        path = path.split('?', 1)[0]
+
+        if method == "POST" and path == "/user/":
+            with cls._lock:
+                user_id = str(response.json()["id"])
+                cls._users[cls._key(user_id)] = {
+                    "user_id": user_id,
+                    "env": ENV_OBJECT.get_env(),
+                    "email": data["email"],
+                    "password": data["password"],
+                    "test": RequestTimings.get_test_name()
+                }
+        elif method == "POST" and path == "/user/login":
+            with cls._lock:
+                user = cls._users.get(cls._key(response.json().get("user_id")))
+                if user is not None:
+                    user["auth_sid"] = response.cookies.get("auth_sid")
+                    user["token"] = response.headers.get("x-csrf-token")
+        elif method == "DELETE":
+            match = cls.user_path.match(path)
+            if match is not None:
+                with cls._lock:
+                    cls._users.pop(cls._key(match.group(1)), None)
+                    cls._kept.discard(cls._key(match.group(1)))
+
+    @classmethod
+    def keep(cls, user_id):
+        # Users returned to the shared pool live until the end of the session
+        with cls._lock:
+            cls._kept.add(cls._key(user_id))
+
+    @classmethod
+    def assign(cls, user_id, test: str):
+        # Hands a user created ahead of time over to the test that uses it
+        with cls._lock:
+            user = cls._users.get(cls._key(user_id))
+            if user is not None:
+                user["test"] = test
+
+    @classmethod
+    def take(cls, test: str = None):
+        with cls._lock:
+            if test is None:
+                users = list(cls._users.values())
+            else:
+                users = [user for user in cls._users.values()
+                         if user["test"] == test and cls._key(user["user_id"], user["env"]) not in cls._kept]
+            for user in users:
+                cls._users.pop(cls._key(user["user_id"], user["env"]), None)
+        return users
+
+    @classmethod
+    def get_failed(cls):
+        with cls._lock:
+            return list(cls._failed)
+
+    @classmethod
+    def add_failed(cls, failed: list):
+        with cls._lock:
+            cls._failed.extend(failed)
+
+    @classmethod
+    def cleanup(cls, test: str = None):
+        users = cls.take(test)
+        if not users:
+            return []
+
+        import asyncio
+        failed = asyncio.run(cls._delete_all(users))
+        cls.add_failed(failed)
+        return failed
+
+    @classmethod
+    async def _delete_all(cls, users: list):
+        import asyncio
+        # Imported here: AsyncMyRequests depends on MyRequests, which tracks users through this module
+        from lib.async_my_requests import AsyncMyRequests
+
+        failed = []
+        for start in range(0, len(users), cls.batch_size):
+            batch = users[start:start + cls.batch_size]
+            with AsyncMyRequests.step(f"Delete {len(batch)} created users"):
+                results = await asyncio.gather(*[cls._delete_user(user) for user in batch], return_exceptions=True)
+            for user, result in zip(batch, results):
+                if result is not None:
+                    failed.append({"user_id": user["user_id"], "env": user["env"], "email": user["email"],
+                                   "reason": str(result)})
+        return failed
+
+    @classmethod
+    async def _delete_user(cls, user: dict):
+        # Imported here: AsyncMyRequests depends on MyRequests, which tracks users through this module
+        from lib.async_my_requests import AsyncMyRequests
+
+        # Set in the task of this user only, the other deletions of the batch run concurrently
+        with ENV_OBJECT.use(user["env"]):
+            token = user.get("token")
+            auth_sid = user.get("auth_sid")
+
+            if not token or not auth_sid:
+                response_login = await AsyncMyRequests.post(
+                    "/user/login",
+                    data={"email": user["email"], "password": user["password"]}
+                )
+                if response_login.status_code != 200:
+                    return f"Login failed with status code {response_login.status_code}"
+                token = response_login.headers.get("x-csrf-token")
+                auth_sid = response_login.cookies.get("auth_sid")
+
+            response_delete = await AsyncMyRequests.delete(
+                f"/user/{user['user_id']}",
+                headers={"x-csrf-token": token},
+                cookies={"auth_sid": auth_sid}
+            )
+            if response_delete.status_code != 200:
+                return f"Delete failed with status code {response_delete.status_code}: {response_delete.text}"
+
+        return None
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+from lib.base_case import BaseCase
+from lib.token_cache import TokenCache
+from lib.user_cleanup import CreatedUsers
+
+
+class UserPool:
+    token_ttl = float(os.environ.get('USER_POOL_TOKEN_TTL', 300))
+    # Fixed account whose own data tests read but never change
+    protected_account = ('vinkotov@example.com', '1234')
+
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    @classmethod
+    def for_environment(cls, env: str):
+        # Users exist in one environment only, so every environment has its own pool
+        with cls._pools_lock:
+            pool = cls._pools.get(env)
+            if pool is None:
+                pool = cls._pools[env] = cls()
+            return pool
+
+    def __init__(self, base_case: BaseCase = None):
+        self.base_case = base_case if base_case is not None else BaseCase()
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def checkout(self):
+        with self._lock:
+            user_data = self._idle.pop() if self._idle else None
+
+        if user_data is None:
+            return self.create()
+
+        return self._refresh_if_expired(user_data)
+
+    def checkout_many(self, count: int):
+        with self._lock:
+            idle_count = min(count, len(self._idle))
+            users = [self._idle.pop() for _ in range(idle_count)]
+
+        users = [self._refresh_if_expired(user_data) for user_data in users]
+
+        missing = count - len(users)
+        if missing:
+            users += self.create_many(missing)
+
+        return users
+
+    def checkin(self, user_data: dict):
+        CreatedUsers.keep(user_data["user_id"])
+        with self._lock:
+            self._idle.append(user_data)
+
+    def idle_count(self):
+        with self._lock:
+            return len(self._idle)
+
+    def create(self):
+        user_data = self.base_case.create_user_and_login()
+        user_data["logged_in_at"] = time.monotonic()
+        return user_data
+
+    def create_many(self, count: int):
+        users = self.base_case.create_users(count)
+        for user_data in users:
+            user_data["logged_in_at"] = time.monotonic()
+        return users
+
+    def get_account(self, email: str, password: str):
+        return TokenCache.get(self.base_case, email, password)
+
+    def get_protected_account(self):
+        return self.get_account(*self.protected_account)
+
+    def _login(self, email: str, password: str):
+        user_data = self.base_case.login(email, password)
+        user_data["logged_in_at"] = time.monotonic()
+        return user_data
+
+    def _refresh_if_expired(self, user_data: dict):
+        if time.monotonic() - user_data["logged_in_at"] < self.token_ttl:
+            return user_data
+
+        if self.base_case.is_logged_in(user_data):
+            user_data["logged_in_at"] = time.monotonic()
+            return user_data
+
+        refreshed = self._login(user_data["email"], user_data["password"])
+        refreshed["user_id"] = user_data["user_id"]
+        return refreshed
@@ -1,6 +1,32 @@
+import itertools
+import math
+import os
 import random
+import re
 import string
 
+_counter = itertools.count(1)
+# Matches generate_unique_suffix() output, with the timestamp digits in front of it in emails
+UNIQUE_SUFFIX_PATTERN = re.compile(r'[0-9]*(?:master|gw[0-9]+)[0-9]+[a-z0-9]{6}')
+
 def generate_random_string(length):
     letters = string.ascii_letters
-    return ''.join(random.choices(letters, k=length))
\ No newline at end of file
+    return ''.join(random.choices(letters, k=length))
+
+
+def get_worker_id():
+    return os.environ.get('PYTEST_XDIST_WORKER', 'master')
+
+
+def generate_unique_suffix():
+    # Worker id and counter make it unique within the run, random part protects from other runs
+    entropy = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
+    return f"{get_worker_id()}{next(_counter)}{entropy}"
+
+
+def percentile(values: list, percent: float):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
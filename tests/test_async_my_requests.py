@@ -0,0 +1,46 @@
+import asyncio
+from contextlib import contextmanager
+import pytest
+import allure
+from lib.allure_steps import AllureSteps
+from lib.async_my_requests import AsyncMyRequests
+from environment import ENV_OBJECT
+
+
+@allure.epic("Test framework")
+@allure.feature("Async requests")
+class TestAsyncMyRequestsSteps:
+    @pytest.fixture
+    def steps(self, monkeypatch):
+        # Titles of the steps opened by AsyncMyRequests, against the local fake
+        titles = []
+
+        @contextmanager
+        def step(title: str):
+            titles.append(title)
+            yield
+
+        monkeypatch.setattr(AllureSteps, "step", step)
+        monkeypatch.setattr(AllureSteps, "attach_text", lambda body, name: titles.append(f"{name}: {body}"))
+        with ENV_OBJECT.use(ENV_OBJECT.LOCAL):
+            yield titles
+
+    @allure.title("Ensure a single awaited request gets its own step like in MyRequests")
+    def test_single_request_step(self, steps):
+        response = asyncio.run(AsyncMyRequests.get("/user/2"))
+
+        assert response.status_code == 200
+        assert steps == ["GET request to URL '/user/2'"]
+
+    @allure.title("Ensure gathered requests share one step with a summary of the batch")
+    def test_batch_step(self, steps):
+        async def gather():
+            with AsyncMyRequests.step("Get two users"):
+                return await asyncio.gather(AsyncMyRequests.get("/user/2"), AsyncMyRequests.get("/user/3"))
+
+        asyncio.run(gather())
+
+        # Requests are listed in the order they completed
+        assert steps[0] == "Get two users"
+        assert len(steps) == 2
+        assert sorted(steps[1].removeprefix("Requests: ").split("\n")) == ["GET /user/2 -> 200", "GET /user/3 -> 200"]
@@ -0,0 +1,52 @@
+import allure
+from lib.cassette import Cassette
+from lib.utils import generate_unique_suffix
+
+
+@allure.epic("Test framework")
+@allure.feature("Cassette record and replay")
+class TestCassette:
+    url = "http://localhost/api/user/"
+
+    @allure.title("Ensure generated emails and usernames do not change the key")
+    def test_unique_values_are_masked(self):
+        first_suffix = generate_unique_suffix()
+        second_suffix = generate_unique_suffix()
+
+        first = Cassette.make_key("POST", self.url, {"email": f"learnqa{first_suffix}@example.com"}, {}, {})
+        second = Cassette.make_key("POST", self.url, {"email": f"learnqa{second_suffix}@example.com"}, {}, {})
+        other = Cassette.make_key("POST", self.url, {"email": "vinkotov@example.com"}, {}, {})
+
+        assert first == second
+        assert first != other
+
+    @allure.title("Ensure auth is keyed by presence, not by the token value")
+    def test_auth_is_keyed_by_presence(self):
+        with_auth = Cassette.make_key("GET", self.url, None, {"x-csrf-token": "a"}, {"auth_sid": "b"})
+        other_tokens = Cassette.make_key("GET", self.url, None, {"x-csrf-token": "c"}, {"auth_sid": "d"})
+        without_auth = Cassette.make_key("GET", self.url, None, {}, {})
+
+        assert with_auth == other_tokens
+        assert with_auth != without_auth
+
+    @allure.title("Ensure a saved response is found again by an equal request")
+    def test_save_and_find(self, tmp_path, monkeypatch):
+        import requests
+
+        monkeypatch.setattr(Cassette, "file_name", str(tmp_path / "cassette.jsonl"))
+        monkeypatch.setattr(Cassette, "_entries", None)
+        monkeypatch.setattr(Cassette, "_file", None)
+
+        response = requests.Response()
+        response.status_code = 400
+        response._content = b"Users with email already exist"
+        response.encoding = "utf-8"
+
+        Cassette.save("POST", self.url, {"email": f"learnqa{generate_unique_suffix()}@example.com"}, {}, {}, response)
+        Cassette.close()
+        monkeypatch.setattr(Cassette, "_entries", None)
+
+        found = Cassette.find("POST", self.url, {"email": f"learnqa{generate_unique_suffix()}@example.com"}, {}, {})
+        assert found.status_code == 400
+        assert found.text == "Users with email already exist"
+        assert Cassette.find("GET", self.url, None, {}, {}) is None
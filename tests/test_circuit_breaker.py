@@ -0,0 +1,71 @@
+import pytest
+import allure
+from lib.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+@allure.epic("Test framework")
+@allure.feature("Circuit breaker")
+class TestCircuitBreaker:
+    url = "http://127.0.0.1:1/user/2"
+
+    @pytest.fixture(autouse=True)
+    def closed_breaker(self, monkeypatch):
+        # The breaker of the session stays as it was
+        monkeypatch.setattr(CircuitBreaker, "failure_threshold", 3)
+        monkeypatch.setattr(CircuitBreaker, "_failures", 0)
+        monkeypatch.setattr(CircuitBreaker, "_reason", None)
+
+    @staticmethod
+    def connection_error():
+        import requests
+        return requests.exceptions.ConnectionError("Connection refused")
+
+    @allure.title("Ensure the breaker opens after failure_threshold connection errors in a row")
+    def test_trips_after_threshold(self):
+        for _ in range(2):
+            CircuitBreaker.record_failure(self.url, self.connection_error())
+        assert not CircuitBreaker.is_open()
+        CircuitBreaker.check()
+
+        CircuitBreaker.record_failure(self.url, self.connection_error())
+
+        assert CircuitBreaker.is_open()
+        assert self.url in CircuitBreaker.get_reason()
+        with pytest.raises(CircuitOpenError):
+            CircuitBreaker.check()
+
+    @allure.title("Ensure a successful request starts the count again")
+    def test_success_resets_failures(self):
+        for _ in range(2):
+            CircuitBreaker.record_failure(self.url, self.connection_error())
+        CircuitBreaker.record_success()
+        for _ in range(2):
+            CircuitBreaker.record_failure(self.url, self.connection_error())
+
+        assert not CircuitBreaker.is_open()
+
+    @allure.title("Ensure errors of a live server never open the breaker")
+    def test_http_errors_do_not_trip(self):
+        import requests
+
+        for _ in range(5):
+            CircuitBreaker.record_failure(self.url, requests.exceptions.HTTPError("500 Server Error"))
+            CircuitBreaker.record_failure(self.url, ValueError("Bad HTTP method"))
+
+        assert not CircuitBreaker.is_open()
+
+    @allure.title("Ensure a threshold of 0 disables the breaker")
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setattr(CircuitBreaker, "failure_threshold", 0)
+        for _ in range(5):
+            CircuitBreaker.record_failure(self.url, self.connection_error())
+
+        assert not CircuitBreaker.is_open()
+
+    @allure.title("Ensure reset() closes an open breaker")
+    def test_reset(self):
+        CircuitBreaker.trip("API is unavailable")
+        CircuitBreaker.reset()
+
+        assert not CircuitBreaker.is_open()
+        CircuitBreaker.check()
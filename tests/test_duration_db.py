@@ -0,0 +1,56 @@
+import allure
+from lib.duration_db import DurationDatabase
+
+
+@allure.epic("Test framework")
+@allure.feature("Test duration database")
+class TestDurationDatabase:
+    @staticmethod
+    def create_db(tmp_path, durations: dict):
+        db = DurationDatabase(str(tmp_path / "durations.json"))
+        for nodeid, duration in durations.items():
+            db.record(nodeid, duration, False)
+        return db
+
+    @allure.title("Ensure the longest tests are spread over the shards first")
+    def test_split_balances_shards(self, tmp_path):
+        db = self.create_db(tmp_path, {"a": 8.0, "b": 5.0, "c": 4.0, "d": 3.0, "e": 2.0})
+
+        assignment = db.split(["a", "b", "c", "d", "e"], 2)
+
+        assert assignment["a"] != assignment["b"]
+        assert sorted(db.get_shard_loads(["a", "b", "c", "d", "e"], 2)) == [11.0, 11.0]
+
+    @allure.title("Ensure unknown tests are expected to take the median duration")
+    def test_unknown_test_gets_median(self, tmp_path):
+        db = self.create_db(tmp_path, {"a": 1.0, "b": 2.0, "c": 9.0})
+
+        assert db.get_duration("a") == 1.0
+        assert db.get_duration("new") == 2.0
+
+    @allure.title("Ensure the median for unknown tests is computed once for all of them")
+    def test_median_is_computed_once(self, tmp_path, monkeypatch):
+        db = self.create_db(tmp_path, {"a": 1.0, "b": 2.0, "c": 9.0})
+        calls = []
+        get_default_duration = db.get_default_duration
+        monkeypatch.setattr(db, "get_default_duration", lambda: calls.append(1) or get_default_duration())
+
+        durations = db.get_durations(["a", "new_1", "new_2"])
+
+        assert durations == {"a": 1.0, "new_1": 2.0, "new_2": 2.0}
+        assert len(calls) == 1
+
+    @allure.title("Ensure an empty database falls back to the default duration")
+    def test_empty_database(self, tmp_path):
+        db = DurationDatabase(str(tmp_path / "durations.json"))
+        assert db.get_duration("a") == DurationDatabase.default_duration
+
+    @allure.title("Ensure durations are smoothed and survive save and load")
+    def test_record_and_save(self, tmp_path):
+        db = self.create_db(tmp_path, {"a": 1.0})
+        db.record("a", 2.0, True)
+        db.save()
+
+        loaded = DurationDatabase(db.file_name)
+        assert loaded.get_duration("a") == 1.0 + (2.0 - 1.0) * DurationDatabase.smoothing
+        assert loaded.get_failure_score("a") == DurationDatabase.smoothing
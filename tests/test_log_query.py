@@ -0,0 +1,66 @@
+import json
+import allure
+from lib.log_query import LogIndex, aggregate
+
+
+@allure.epic("Test framework")
+@allure.feature("Request log query")
+class TestLogIndex:
+    records = [
+        {"test": "tests/test_a.py::test_get", "endpoint": "GET /user/{id}", "status": 200, "elapsed_ms": 10.0},
+        {"test": "tests/test_a.py::test_get", "endpoint": "GET /user/{id}", "status": 404, "elapsed_ms": 20.0},
+        {"test": "tests/test_b.py::test_edit", "endpoint": "PUT /user/{id}", "status": 200, "elapsed_ms": 30.0},
+        {"test": "tests/test_b.py::test_edit", "endpoint": "GET /user/{id}", "status": 200, "elapsed_ms": 40.0}
+    ]
+
+    @staticmethod
+    def write_log(file_name: str, records: list, mode: str = 'w'):
+        with open(file_name, mode, encoding='utf-8') as log_file:
+            for record in records:
+                log_file.write(json.dumps(record) + "\n")
+
+    @staticmethod
+    def elapsed(index: LogIndex, **filters):
+        return [record["elapsed_ms"] for record in index.read(index.find(**filters))]
+
+    @allure.title("Ensure filters are combined and every record is found by its offset")
+    def test_find(self, tmp_path):
+        file_name = str(tmp_path / "log.jsonl")
+        self.write_log(file_name, self.records)
+        index = LogIndex(file_name).load()
+
+        assert self.elapsed(index) == [10.0, 20.0, 30.0, 40.0]
+        assert self.elapsed(index, test="test_b.py") == [30.0, 40.0]
+        assert self.elapsed(index, endpoint="GET /user/{id}", status=200) == [10.0, 40.0]
+        assert self.elapsed(index, test="test_a.py", endpoint="GET /user/{id}", status="404") == [20.0]
+        assert self.elapsed(index, test="test_a.py", endpoint="PUT /user/{id}") == []
+
+    @allure.title("Ensure the index is stored next to the log and reused while the log is unchanged")
+    def test_index_is_reused(self, tmp_path, monkeypatch):
+        file_name = str(tmp_path / "log.jsonl")
+        self.write_log(file_name, self.records)
+        LogIndex(file_name).load()
+        assert (tmp_path / "log.jsonl.idx").exists()
+
+        def build(index):
+            raise AssertionError("the index was built again")
+
+        monkeypatch.setattr(LogIndex, "build", build)
+        assert self.elapsed(LogIndex(file_name).load(), status=404) == [20.0]
+
+    @allure.title("Ensure the index is built again when the log changes")
+    def test_index_is_invalidated(self, tmp_path):
+        file_name = str(tmp_path / "log.jsonl")
+        self.write_log(file_name, self.records)
+        LogIndex(file_name).load()
+
+        self.write_log(file_name, [{"test": "tests/test_c.py::test_new", "endpoint": "DELETE /user/{id}",
+                                    "status": 200, "elapsed_ms": 50.0}], mode='a')
+
+        assert self.elapsed(LogIndex(file_name).load(), endpoint="DELETE /user/{id}") == [50.0]
+
+    @allure.title("Ensure latency is aggregated by field with the shared percentile")
+    def test_aggregate(self):
+        rows = aggregate(self.records, "endpoint")
+
+        assert rows == [("PUT /user/{id}", 1, 30.0, 30.0, 30.0), ("GET /user/{id}", 3, 70.0 / 3, 40.0, 40.0)]
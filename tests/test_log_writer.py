@@ -0,0 +1,60 @@
+import threading
+import pytest
+import allure
+from lib.log_writer import LogWriter
+
+
+@allure.epic("Test framework")
+@allure.feature("Log writer")
+class TestLogWriter:
+    @allure.title("Ensure the log is rotated by size and only backup_count old files are kept")
+    def test_rotation_by_size(self, tmp_path):
+        file_name = str(tmp_path / "log.txt")
+        writer = LogWriter(file_name, batch_size=1, max_file_size=10, backup_count=2)
+        for index in range(4):
+            writer.write(f"line {index}\n")
+            writer.flush()
+        writer.close()
+
+        assert (tmp_path / "log.txt").read_text() == "line 3\n"
+        assert (tmp_path / "log.txt.1").read_text() == "line 2\n"
+        assert (tmp_path / "log.txt.2").read_text() == "line 1\n"
+        assert not (tmp_path / "log.txt.3").exists()
+
+    @allure.title("Ensure a failed write loses its batch but not the writer thread")
+    def test_failed_batch_does_not_stop_writer(self, tmp_path, capsys):
+        file_name = str(tmp_path / "log.txt")
+        writer = LogWriter(file_name, batch_size=1)
+        write_batch = writer._write_batch
+        calls = []
+
+        def fail_once(batch):
+            calls.append(batch)
+            if len(calls) == 1:
+                raise OSError("disk full")
+            write_batch(batch)
+
+        writer._write_batch = fail_once
+        writer.write("lost\n")
+        writer.write("kept\n")
+
+        # flush() waits for every line, a dead writer thread would make it hang
+        flushing = threading.Thread(target=writer.flush, daemon=True)
+        flushing.start()
+        flushing.join(5)
+        assert not flushing.is_alive()
+
+        writer.close()
+        assert (tmp_path / "log.txt").read_text() == "kept\n"
+        assert "disk full" in capsys.readouterr().err
+
+    @allure.title("Ensure writing to a closed writer fails instead of starting a new thread")
+    def test_write_after_close(self, tmp_path):
+        writer = LogWriter(str(tmp_path / "log.txt"))
+        writer.write("line\n")
+        writer.close()
+
+        with pytest.raises(ValueError):
+            writer.write("late line\n")
+        assert writer._thread is None
+        assert (tmp_path / "log.txt").read_text() == "line\n"
@@ -0,0 +1,79 @@
+import json
+import pytest
+import allure
+from lib.fake_api import FakeApiServer
+from lib.response import CachedResponse, StreamedBody
+
+
+@allure.epic("Test framework")
+@allure.feature("Cached response")
+class TestCachedResponse:
+    @staticmethod
+    def create_response(body: bytes):
+        import requests
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.encoding = "utf-8"
+        return CachedResponse(response)
+
+    @allure.title("Ensure JSON is parsed once and the same value is returned")
+    def test_json_is_cached(self):
+        response = self.create_response(b'{"username": "Vitaliy"}')
+
+        assert response.json() == {"username": "Vitaliy"}
+        assert response.json() is response.json()
+        assert response.json(parse_int=str) == {"username": "Vitaliy"}
+
+    @allure.title("Ensure a body that is not JSON raises JSONDecodeError every time")
+    def test_json_error_is_cached(self):
+        response = self.create_response(b"User not found")
+
+        for _ in range(2):
+            with pytest.raises(json.JSONDecodeError):
+                response.json()
+        assert response.text == "User not found"
+
+    @allure.title("Ensure long bodies are truncated in the log, 0 keeps the whole body")
+    def test_log_body_is_truncated(self):
+        response = self.create_response(b"User not found")
+
+        assert response.get_log_body(4) == "User... [truncated 10 chars]"
+        assert response.get_log_body(0) == "User not found"
+
+
+@allure.epic("Test framework")
+@allure.feature("Streamed response body")
+class TestStreamedBody:
+    @staticmethod
+    def get(path: str, chunk_size: int, memory_limit: int, preview_size: int):
+        import requests
+
+        response = requests.get(f"{FakeApiServer.get_base_url()}{path}", stream=True)
+        body = StreamedBody(response, chunk_size, memory_limit, preview_size)
+        return CachedResponse(response, body), body
+
+    @allure.title("Ensure a small body stays in memory")
+    def test_small_body_in_memory(self):
+        response, body = self.get("/user/2", 4, 1024, 1024)
+
+        assert not body._spool._rolled
+        assert body.size == len(b'{"username": "Vitaliy"}')
+        assert response.get_log_body(1024) == '{"username": "Vitaliy"}'
+        assert response.json() == {"username": "Vitaliy"}
+
+    @allure.title("Ensure a body over the memory limit is spooled to disk and logged as a preview")
+    def test_large_body_on_disk(self):
+        response, body = self.get("/user/2", 4, 8, 5)
+
+        assert body._spool._rolled
+        assert body.preview == b'{"use'
+        assert response.get_log_body(5) == f'{{"use... [streamed {body.size} bytes, sha256 {body.sha256}]'
+        assert response.json() == {"username": "Vitaliy"}
+
+    @allure.title("Ensure a log length of 0 logs the whole streamed body")
+    def test_no_truncation(self):
+        response, body = self.get("/user/2", 4, 8, 0)
+
+        assert response.get_log_body(0) == '{"username": "Vitaliy"}'
@@ -0,0 +1,66 @@
+from collections import defaultdict
+import pytest
+import allure
+from lib.retry import RetryScheduler, TokenBucket
+
+
+@allure.epic("Test framework")
+@allure.feature("Retries and rate limiting")
+class TestRetry:
+    @pytest.fixture
+    def rate_limiter(self, monkeypatch):
+        rate_limiter = TokenBucket(10, min_rate=2)
+        monkeypatch.setattr(RetryScheduler, "rate_limiter", rate_limiter)
+        monkeypatch.setattr(RetryScheduler, "_counters", defaultdict(lambda: defaultdict(float)))
+        return rate_limiter
+
+    @allure.title("Ensure the rate is halved on throttling, but not below the minimal rate")
+    def test_rate_decreases_multiplicatively(self):
+        bucket = TokenBucket(10, min_rate=2)
+        bucket.on_throttled()
+        assert bucket.rate == 5
+        bucket.on_throttled()
+        bucket.on_throttled()
+        assert bucket.rate == 2
+
+    @allure.title("Ensure the rate grows back additively up to the configured rate")
+    def test_rate_increases_additively(self):
+        bucket = TokenBucket(10, min_rate=2)
+        bucket.on_throttled()
+        bucket.on_success()
+        assert bucket.rate == pytest.approx(5.5)
+        for _ in range(20):
+            bucket.on_success()
+        assert bucket.rate == 10
+
+    @allure.title("Ensure a bucket without a rate never delays requests")
+    def test_unlimited_bucket(self):
+        assert TokenBucket(0).acquire() == 0.0
+
+    @allure.title("Ensure a retried 5xx does not grow the rate")
+    def test_server_error_is_not_success(self, rate_limiter):
+        rate_limiter.on_throttled()
+
+        assert RetryScheduler.should_retry_status("GET /user/{id}", "GET", 503, 0)
+        assert rate_limiter.rate == 5
+
+        assert not RetryScheduler.should_retry_status("GET /user/{id}", "GET", 200, 1)
+        assert rate_limiter.rate == 5.5
+
+    @allure.title("Ensure a 5xx that is never retried does not grow the rate either")
+    def test_internal_server_error_is_not_success(self, rate_limiter):
+        rate_limiter.on_throttled()
+
+        assert not RetryScheduler.should_retry_status("GET /user/{id}", "GET", 500, 0)
+        assert rate_limiter.rate == 5
+        assert "failures" not in RetryScheduler.get_counters().get("GET /user/{id}", {})
+
+    @allure.title("Ensure a 5xx is counted as a failure when retries are exhausted")
+    def test_exhausted_retries_are_failures(self, rate_limiter):
+        assert not RetryScheduler.should_retry_status("GET /user/{id}", "GET", 503, RetryScheduler.max_retries)
+        assert not RetryScheduler.should_retry_status("POST /user/", "POST", 502, 0)
+        assert not RetryScheduler.should_retry_status("GET /user/{id}", "GET", 404, 0)
+
+        counters = RetryScheduler.get_counters()
+        assert counters["GET /user/{id}"]["failures"] == 1
+        assert counters["POST /user/"]["failures"] == 1
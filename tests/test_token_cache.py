@@ -0,0 +1,94 @@
+import json
+import pytest
+import allure
+from lib.base_case import BaseCase
+from lib.token_cache import TokenCache
+from environment import ENV_OBJECT
+
+
+class CountingCase(BaseCase):
+    # Records the requests TokenCache makes through the test case
+    def __init__(self):
+        self.calls = []
+
+    def login(self, email, password):
+        self.calls.append("login")
+        return super().login(email, password)
+
+    def is_logged_in(self, user_data):
+        self.calls.append("auth")
+        return super().is_logged_in(user_data)
+
+
+@allure.epic("Test framework")
+@allure.feature("Token cache")
+class TestTokenCache:
+    email = "vinkotov@example.com"
+    password = "1234"
+
+    @pytest.fixture(autouse=True)
+    def local_cache(self, tmp_path, monkeypatch):
+        # Always against the local fake, the cache file is private to the test
+        monkeypatch.setattr(TokenCache, "file_name", str(tmp_path / "tokens.json"))
+        monkeypatch.setattr(TokenCache, "_entries", None)
+        with ENV_OBJECT.use(ENV_OBJECT.LOCAL):
+            yield
+
+    def get_entry(self):
+        return TokenCache._load()[TokenCache.make_key(self.email, self.password)]
+
+    @allure.title("Ensure a fresh session is used without any request")
+    def test_fresh_entry(self):
+        base_case = CountingCase()
+        first = TokenCache.get(base_case, self.email, self.password)
+        second = TokenCache.get(base_case, self.email, self.password)
+
+        assert base_case.calls == ["login"]
+        assert second == first
+
+    @allure.title("Ensure an older session is checked with one /user/auth request")
+    def test_stale_entry_is_revalidated(self):
+        base_case = CountingCase()
+        user_data = TokenCache.get(base_case, self.email, self.password)
+        self.get_entry()["checked_at"] -= TokenCache.trust_time + 1
+
+        assert TokenCache.get(base_case, self.email, self.password) == user_data
+        assert base_case.calls == ["login", "auth"]
+        # The check counts as fresh again
+        TokenCache.get(base_case, self.email, self.password)
+        assert base_case.calls == ["login", "auth"]
+
+    @allure.title("Ensure a session rejected by /user/auth is replaced by a new login")
+    def test_invalid_entry_logs_in_again(self):
+        base_case = CountingCase()
+        TokenCache.get(base_case, self.email, self.password)
+        self.get_entry()["checked_at"] -= TokenCache.trust_time + 1
+        self.get_entry()["auth_sid"] = "expired"
+
+        user_data = TokenCache.get(base_case, self.email, self.password)
+
+        assert base_case.calls == ["login", "auth", "login"]
+        assert user_data["auth_sid"] != "expired"
+
+    @allure.title("Ensure an expired session is not even checked")
+    def test_expired_entry_logs_in_again(self):
+        base_case = CountingCase()
+        TokenCache.get(base_case, self.email, self.password)
+        self.get_entry()["checked_at"] -= TokenCache.ttl + 1
+        self.get_entry()["logged_in_at"] -= TokenCache.ttl + 1
+
+        TokenCache.get(base_case, self.email, self.password)
+
+        assert base_case.calls == ["login", "login"]
+
+    @allure.title("Ensure the cache file is reused by a new process and keeps no passwords")
+    def test_file_persistence(self, monkeypatch):
+        user_data = TokenCache.get(CountingCase(), self.email, self.password)
+
+        with open(TokenCache.file_name, encoding='utf-8') as cache_file:
+            assert self.password not in json.dumps(json.load(cache_file))
+
+        monkeypatch.setattr(TokenCache, "_entries", None)
+        base_case = CountingCase()
+        assert TokenCache.get(base_case, self.email, self.password) == user_data
+        assert base_case.calls == []
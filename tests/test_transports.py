@@ -0,0 +1,96 @@
+import pytest
+import allure
+from lib.circuit_breaker import CircuitBreaker
+from lib.fake_api import FakeApiServer
+from lib.retry import RetryScheduler
+from lib.transports import Http2Transport, RequestsTransport, Transport, create_transport
+
+
+@allure.epic("Test framework")
+@allure.feature("HTTP transports")
+class TestTransports:
+    @allure.title("Ensure a transport has to implement send()")
+    def test_transport_is_abstract(self):
+        class Incomplete(Transport):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            Incomplete()
+        assert isinstance(create_transport("requests"), RequestsTransport)
+        with pytest.raises(Exception, match="Unknown HTTP transport"):
+            create_transport("http3")
+
+
+@allure.epic("Test framework")
+@allure.feature("HTTP transports")
+class TestHttp2Transport:
+    @pytest.fixture(autouse=True)
+    def httpx(self):
+        return pytest.importorskip("httpx")
+
+    @allure.title("Ensure an httpx response is converted to an equal requests response")
+    def test_to_requests_response(self, httpx):
+        def handler(request):
+            # A stream like from the network, the client reads it and sets the elapsed time
+            return httpx.Response(201, stream=httpx.ByteStream(b'{"id": "7"}'), request=request, headers=[
+                ("Content-Type", "application/json"),
+                ("X-Trace", "a"),
+                ("X-Trace", "b"),
+                ("Set-Cookie", "auth_sid=secret; Path=/")
+            ])
+
+        with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+            response = Http2Transport._to_requests_response(
+                client.post("http://localhost/api/user/", data={"email": "learnqa@example.com"})
+            )
+
+        assert response.status_code == 201
+        assert response.url == "http://localhost/api/user/"
+        assert response.headers["x-trace"] == "a, b"
+        assert response.cookies.get("auth_sid") == "secret"
+        assert response.json() == {"id": "7"}
+        assert response.elapsed.total_seconds() >= 0
+        assert response.request.method == "POST"
+        assert response.request.body == b"email=learnqa%40example.com"
+        # A streamed read in MyRequests gets the body from memory
+        assert b"".join(response.iter_content(4)) == b'{"id": "7"}'
+
+    @allure.title("Ensure connection errors of httpx are retried and trip the breaker like those of requests")
+    def test_convert_connect_errors(self, httpx):
+        url = "http://127.0.0.1:1/user/2"
+        connect_error = Http2Transport._convert_error(httpx.ConnectError("Connection refused"), url)
+        connect_timeout = Http2Transport._convert_error(httpx.ConnectTimeout("timed out"), url)
+
+        for error in (connect_error, connect_timeout):
+            assert RetryScheduler.is_connect_error(error)
+            assert RetryScheduler.should_retry_error("POST", error, 0)
+            assert CircuitBreaker.is_connection_error(error)
+
+    @allure.title("Ensure errors after the request was sent are retried for idempotent methods only")
+    def test_convert_read_errors(self, httpx):
+        import requests
+
+        url = "http://127.0.0.1:1/user/2"
+        read_timeout = Http2Transport._convert_error(httpx.ReadTimeout("timed out"), url)
+        protocol_error = Http2Transport._convert_error(httpx.RemoteProtocolError("disconnected"), url)
+
+        assert isinstance(read_timeout, requests.exceptions.ReadTimeout)
+        assert isinstance(protocol_error, requests.exceptions.ConnectionError)
+        for error in (read_timeout, protocol_error):
+            assert not RetryScheduler.is_connect_error(error)
+            assert RetryScheduler.should_retry_error("GET", error, 0)
+            assert not RetryScheduler.should_retry_error("POST", error, 0)
+
+    @allure.title("Ensure a request through the HTTP/2 client reaches the local fake")
+    def test_send(self):
+        pytest.importorskip("h2")
+        base_url = FakeApiServer.get_base_url()
+        transport = Http2Transport()
+        try:
+            response = transport.send(base_url, "GET", f"{base_url}/user/2", None, {}, {"auth_sid": "none"},
+                                      (5, 5), False)
+        finally:
+            transport.close()
+
+        assert response.status_code == 200
+        assert response.json() == {"username": "Vitaliy"}
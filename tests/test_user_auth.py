@@ -7,25 +7,19 @@ from lib.my_requests import MyRequests
 @allure.epic("Authorization")
 @allure.feature("Login and session verification")
 @allure.tag("regression")
+@pytest.mark.multi_env
 class TestUserAuth(BaseCase):
     exclude_params = [
         ("no_cookie"),
         ("no_token")
     ]
 
-    def setup_method(self):
-        with allure.step("Log in with valid credentials"):
-            data = {
-                'email': 'vinkotov@example.com',
-                'password': '1234'
-            }
-
-            response_login = MyRequests.post("/user/login", data=data)
-
-        with allure.step("Get auth_sid, token and user_id from response"):
-            self.auth_sid = self.get_cookie(response_login, "auth_sid")
-            self.token = self.get_header(response_login, "x-csrf-token")
-            self.user_id_from_auth_method = self.get_json_value(response_login, "user_id")
+    @pytest.fixture(autouse=True)
+    def setup(self, protected_user):
+        with allure.step("Get auth_sid, token and user_id of logged in user"):
+            self.auth_sid = protected_user["auth_sid"]
+            self.token = protected_user["token"]
+            self.user_id_from_auth_method = protected_user["user_id"]
 
 
     @allure.story("Successful login and auth check")
@@ -1,3 +1,4 @@
+import pytest
 import allure
 from lib.base_case import BaseCase
 from lib.assertions import Assertions
@@ -10,19 +11,11 @@ class TestUserDelete(BaseCase):
     @allure.story("Deleting protected user")
     @allure.title("Ensure protected user cannot be deleted")
     @allure.description("Test verifies a protected user cannot be deleted")
-    def test_delete_protected_user(self):
+    @pytest.mark.multi_env
+    def test_delete_protected_user(self, protected_user):
         with allure.step("Login as protected user (ID 2)"):
-            data = {
-            'email': 'vinkotov@example.com',
-            'password': '1234'
-            }
-
-            response_login = MyRequests.post("/user/login", data=data)
-
-            Assertions.assert_code_status(response_login, 200)
-
-            token = self.get_header(response_login, "x-csrf-token")
-            auth_sid = self.get_cookie(response_login, "auth_sid")
+            token = protected_user["token"]
+            auth_sid = protected_user["auth_sid"]
 
         with allure.step("Try to delete protected user"):
             response_delete = MyRequests.delete(
@@ -41,9 +34,9 @@ class TestUserDelete(BaseCase):
     @allure.title("Ensure user can be deleted")
     @allure.description("Test verifies a user can delete their own account successfully")
     @allure.tag("smoke")
-    def test_delete_user_successfully(self):
+    def test_delete_user_successfully(self, fresh_user):
         with allure.step("Register and login as a new user"):
-            data = self.create_user_and_login()
+            data = fresh_user
 
             user_id = data["user_id"]
             token = data["token"]
@@ -68,21 +61,15 @@ class TestUserDelete(BaseCase):
     @allure.story("Deleting another user")
     @allure.title("Ensure user cannot delete another user")
     @allure.description("Test verifies one user cannot delete another user's data")
-    def test_delete_user_as_another_user(self):
-        with allure.step("Register and login as user1"):
-            user1_data = self.create_user_and_login()
+    @pytest.mark.needs(shared_users=2)
+    @pytest.mark.multi_env
+    def test_delete_user_as_another_user(self, shared_users):
+        with allure.step("Login as user1 and get user2"):
+            user1_data, user2_data = shared_users(2)
+
             token_user1 = user1_data["token"]
             auth_sid_user1 = user1_data["auth_sid"]
-
-        with allure.step("Register user2"):
-            user2_data = self.prepare_registration_data()
-
-            response_create = MyRequests.post("/user/", data=user2_data)
-
-            Assertions.assert_code_status(response_create, 200)
-            Assertions.assert_json_has_key(response_create, "id")
-
-            user2_id = self.get_json_value(response_create, "id")
+            user2_id = user2_data["user_id"]
 
         with allure.step("Try to delete user2 while logged in as user1"):
             response_delete = MyRequests.delete(
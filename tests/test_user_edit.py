@@ -3,6 +3,7 @@ import allure
 from lib.base_case import BaseCase
 from lib.assertions import Assertions
 from lib.my_requests import MyRequests
+from lib.async_my_requests import AsyncMyRequests
 from lib.utils import generate_random_string
 
 @allure.epic("User details")
@@ -26,9 +27,9 @@ class TestUserEdit(BaseCase):
     @allure.title("Ensure user can successfully change own first name")
     @allure.description("Test verifies an authenticated user can edit their own first name")
     @allure.tag("smoke")
-    def test_edit_just_created_user(self):
+    def test_edit_just_created_user(self, fresh_user):
         with allure.step("Register and login user"):
-            data = self.create_user_and_login()
+            data = fresh_user
 
             user_id = data["user_id"]
             token = data["token"]
@@ -61,18 +62,10 @@ class TestUserEdit(BaseCase):
     @allure.story("Edit own user data")
     @allure.title("Ensure user cannot edit data without being authorized")
     @allure.description("Test verifies unauthorized user cannot edit any user data")
-    def test_edit_user_without_auth(self):
-        with allure.step("Prepare registration data"):
-            data = self.prepare_registration_data()
-
-        with allure.step("Send request to register new user"):
-            response_create = MyRequests.post("/user/", data=data)
-
-        with allure.step("Verify user is created"):
-            Assertions.assert_code_status(response_create, 200)
-            Assertions.assert_json_has_key(response_create, "id")
-
-            user_id = self.get_json_value(response_create, "id")
+    @pytest.mark.multi_env
+    def test_edit_user_without_auth(self, shared_user):
+        with allure.step("Get existing user"):
+            user_id = shared_user["user_id"]
 
         with allure.step("Try to edit user without auth"):
             response_edit = MyRequests.put(
@@ -88,21 +81,15 @@ class TestUserEdit(BaseCase):
     @allure.story("Edit another user's data")
     @allure.title("Ensure user cannotedit other users' data")
     @allure.description("Test verifies an authenticated user cannot edit data of another user")
-    def test_edit_user_as_another_user(self):
-        with allure.step("Register and login as user1"):
-            user1_data = self.create_user_and_login()
+    @pytest.mark.needs(shared_users=2)
+    @pytest.mark.multi_env
+    def test_edit_user_as_another_user(self, shared_users):
+        with allure.step("Login as user1 and get user2"):
+            user1_data, user2_data = shared_users(2)
+
             token_user1 = user1_data["token"]
             auth_sid_user1 = user1_data["auth_sid"]
-
-        with allure.step("Register user2"):
-            user2_data = self.prepare_registration_data()
-
-            response_create = MyRequests.post("/user/", data=user2_data)
-
-            Assertions.assert_code_status(response_create, 200)
-            Assertions.assert_json_has_key(response_create, "id")
-
-            user2_id = self.get_json_value(response_create, "id")
+            user2_id = user2_data["user_id"]
 
         with allure.step("Try to edit user2 while logged in as user1"):
             response_edit = MyRequests.put(
@@ -121,11 +108,12 @@ class TestUserEdit(BaseCase):
     @allure.story("Edit own user data")
     @allure.title("Ensure user cannot update data with invalid fields")
     @allure.description("Test verifies error response when updating with invalid email or too short first name")
-    @pytest.mark.parametrize("field, value, expected_message", invalid_params)
+    @pytest.mark.parametrize("field, value, expected_message", invalid_params, ids=[param[0] for param in invalid_params])
     @allure.tag("smoke")
-    def test_edit_user_with_invalid_data(self, field, value, expected_message):
-        with allure.step("Register and login user"):
-            data = self.create_user_and_login()
+    @pytest.mark.multi_env
+    def test_edit_user_with_invalid_data(self, field, value, expected_message, shared_user):
+        with allure.step("Login user"):
+            data = shared_user
 
             user_id = data["user_id"]
             token = data["token"]
@@ -142,4 +130,40 @@ class TestUserEdit(BaseCase):
         with allure.step("Verify error message"):
             Assertions.assert_code_status(response, 400)
             assert (response.json()["error"] ==
-                    expected_message), f"Unexpected response: {response.text}"
\ No newline at end of file
+                    expected_message), f"Unexpected response: {response.text}"
+
+
+    @allure.story("Edit own user data")
+    @allure.title("Ensure simultaneous edits of one user are all applied consistently")
+    @allure.description("Test verifies parallel edits of the same user succeed and the user keeps one of the sent names")
+    def test_edit_user_concurrently(self, fresh_user):
+        with allure.step("Register and login user"):
+            user_id = fresh_user["user_id"]
+            token = fresh_user["token"]
+            auth_sid = fresh_user["auth_sid"]
+
+            new_names = [f"Changed Name {index}" for index in range(10)]
+
+        with allure.step("Edit user first name with parallel requests"):
+            responses = self.run_concurrently([
+                AsyncMyRequests.put(
+                    f"/user/{user_id}",
+                    headers={"x-csrf-token": token},
+                    cookies={"auth_sid": auth_sid},
+                    data={'firstName': new_name}
+                )
+                for new_name in new_names
+            ])
+
+            for response_edit in responses:
+                Assertions.assert_code_status(response_edit, 200)
+
+        with allure.step("Verify user has one of the sent names"):
+            response_check = MyRequests.get(
+                f"/user/{user_id}",
+                headers={"x-csrf-token": token},
+                cookies={"auth_sid": auth_sid}
+            )
+            first_name = self.get_json_value(response_check, "firstName")
+
+            assert first_name in new_names, f"Unexpected user name after parallel edits: '{first_name}'"
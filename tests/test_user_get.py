@@ -1,3 +1,4 @@
+import pytest
 import allure
 from lib.base_case import BaseCase
 from lib.assertions import Assertions
@@ -6,6 +7,7 @@ from lib.my_requests import MyRequests
 @allure.epic("User details")
 @allure.feature("Getting user details")
 @allure.tag("regression")
+@pytest.mark.multi_env
 class TestUserGet(BaseCase):
     @allure.story("Unauthorized user details access")
     @allure.title("Ensure only 'username' is visible without auth")
@@ -16,28 +18,18 @@ class TestUserGet(BaseCase):
             response = MyRequests.get("/user/2")
 
         with allure.step("Verify only 'username' is visible and other fields are not"):
-            Assertions.assert_json_has_key(response, "username")
-            Assertions.assert_json_has_not_key(response, "email")
-            Assertions.assert_json_has_not_key(response, "firstName")
-            Assertions.assert_json_has_not_key(response, "lastName")
+            Assertions.assert_schema(response, "GET /user/{id}", "not_same_user")
 
 
     @allure.story("Authorized user details access")
     @allure.title("Ensure full user details are visible with auth")
     @allure.description("Test verifies an authenticated user can get full details about their own account")
     @allure.tag("smoke")
-    def test_get_user_details_auth_as_same_user(self):
+    def test_get_user_details_auth_as_same_user(self, protected_user):
         with allure.step("Log in with valid credentials"):
-            data = {
-                'email': 'vinkotov@example.com',
-                'password': '1234'
-            }
-
-            response_login = MyRequests.post("/user/login", data=data)
-
-            auth_sid = self.get_cookie(response_login, "auth_sid")
-            token = self.get_header(response_login, "x-csrf-token")
-            user_id_from_auth_method = self.get_json_value(response_login, "user_id")
+            auth_sid = protected_user["auth_sid"]
+            token = protected_user["token"]
+            user_id_from_auth_method = protected_user["user_id"]
 
         with allure.step("Send request to get user (ID 2) data with authentication"):
             response_get_details = MyRequests.get(
@@ -47,28 +39,19 @@ class TestUserGet(BaseCase):
             )
 
         with allure.step("Verify all user details are visible"):
-            expected_fields = ["username", "email", "firstName", "lastName"]
-
-            Assertions.assert_json_has_keys(response_get_details, expected_fields)
+            Assertions.assert_schema(response_get_details, "GET /user/{id}", "same_user")
 
     @allure.story("Authorized user details access")
     @allure.title("Ensure limited user details are visible to other users")
     @allure.description("Test verifies an authenticated user can only see 'username' of other users")
-    def test_get_user_details_auth_as_another_user(self):
-        with allure.step("Register and login as user1"):
-            user1_data = self.create_user_and_login()
+    @pytest.mark.needs(shared_users=2)
+    def test_get_user_details_auth_as_another_user(self, shared_users):
+        with allure.step("Login as user1 and get user2"):
+            user1_data, user2_data = shared_users(2)
+
             token_user1 = user1_data["token"]
             auth_sid_user1 = user1_data["auth_sid"]
-
-        with allure.step("Register user2"):
-            user2_data = self.prepare_registration_data()
-
-            response_create = MyRequests.post("/user/", data=user2_data)
-
-            Assertions.assert_code_status(response_create, 200)
-            Assertions.assert_json_has_key(response_create, "id")
-
-            user2_id = self.get_json_value(response_create, "id")
+            user2_id = user2_data["user_id"]
 
         with allure.step("Try to get user2 details while logged in as user1"):
             response_get_details = MyRequests.get(
@@ -78,7 +61,4 @@ class TestUserGet(BaseCase):
             )
 
         with allure.step("Verify only 'username' is visible and other fields are not"):
-            Assertions.assert_json_has_key(response_get_details, "username")
-            Assertions.assert_json_has_not_key(response_get_details, "email")
-            Assertions.assert_json_has_not_key(response_get_details, "firstName")
-            Assertions.assert_json_has_not_key(response_get_details, "lastName")
\ No newline at end of file
+            Assertions.assert_schema(response_get_details, "GET /user/{id}", "not_same_user")
\ No newline at end of file
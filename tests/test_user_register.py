@@ -36,6 +36,7 @@ class TestUserRegister(BaseCase):
     @allure.story("Create user with existing email")
     @allure.title("Ensure a new user cannot be created with existing email")
     @allure.description("Test checks user registration with an existing email returns error")
+    @pytest.mark.multi_env
     def test_create_user_with_existing_email(self):
         with allure.step("Prepare data with existing email"):
             email = 'vinkotov@example.com'
@@ -54,6 +55,7 @@ class TestUserRegister(BaseCase):
     @allure.title("Ensure a new user cannot be created with invalid email")
     @allure.description("Test checks user registration with an invalid email returns error")
     @allure.tag("smoke")
+    @pytest.mark.multi_env
     def test_create_user_with_invalid_email(self):
         with allure.step("Prepare data with invalid email"):
             email = 'with_no_at_sign_example.com'
@@ -71,6 +73,7 @@ class TestUserRegister(BaseCase):
     @allure.story("Create user with short name")
     @allure.title("Ensure a new user cannot be created with short name")
     @allure.description("Test checks user registration with short name returns error")
+    @pytest.mark.multi_env
     def test_create_user_with_short_name(self):
         with allure.step("Prepare data with short first name"):
             data = self.prepare_registration_data()
@@ -89,6 +92,7 @@ class TestUserRegister(BaseCase):
     @allure.story("Create user with long name")
     @allure.title("Ensure a new user cannot be created with long name")
     @allure.description("Test checks user registration with long name returns error")
+    @pytest.mark.multi_env
     def test_create_user_with_long_name(self):
         with allure.step("Prepare data with long first name"):
             data = self.prepare_registration_data()
@@ -110,6 +114,7 @@ class TestUserRegister(BaseCase):
     @allure.description("Test checks user registration without any required field returns error")
     @pytest.mark.parametrize("missing_field", exclude_params)
     @allure.tag("smoke")
+    @pytest.mark.multi_env
     def test_create_user_without_one_field(self, missing_field):
         with allure.step(f"Prepare registration data without field: {missing_field}"):
             data = self.prepare_registration_data()